@@ -1,6 +1,7 @@
 # bot.py
 import logging
 import os
+import sys
 from logging.handlers import RotatingFileHandler
 
 import discord
@@ -8,9 +9,18 @@ from discord.ext import commands, tasks
 from dotenv import load_dotenv
 
 from utils.config_manager import ConfigManager
+from utils.embed_manager import EmbedManager
 from utils.game_manager import GameManager
 from utils.news_manager import NewsManager
+from utils.outbox_manager import OutboxManager
+from utils.sharding import SHARD_COUNT, SHARD_IDS, ShardFilter
 from utils.subscription_manager import SubscriptionManager
+from utils.webhook_manager import WebhookManager
+
+# Cogs import the shared managers with `from bot import ...`. When this file is
+# run as a script, register it under that name so they get these instances
+# (and their caches) instead of executing the module a second time.
+sys.modules.setdefault("bot", sys.modules[__name__])
 
 # --- Set up logging ---
 os.makedirs("logs", exist_ok=True)
@@ -40,18 +50,37 @@ logger = logging.getLogger("bot")
 # --- Load discord token ---
 load_dotenv()
 TOKEN = os.getenv("DISCORD_TOKEN")
+# Slash commands need no privileged intents. Enable "!" prefix commands (and the
+# message content intent they require) only where they are still wanted.
+ENABLE_PREFIX_COMMANDS = os.getenv("ENABLE_PREFIX_COMMANDS", "false").lower() == "true"
 
 
 # --- Load necessary intents and managers ---
 intents = discord.Intents.default()
-intents.message_content = True
-
-bot = commands.Bot(command_prefix="!", intents=intents)
+intents.message_content = ENABLE_PREFIX_COMMANDS
+
+# Mentioning the bot always works as a prefix, since Discord delivers the
+# content of messages that mention the bot even without the intent.
+# SHARD_COUNT and SHARD_IDS split the bot across processes; by default one
+# process runs every shard and Discord recommends the shard count.
+bot = commands.AutoShardedBot(
+    command_prefix=(
+        commands.when_mentioned_or("!")
+        if ENABLE_PREFIX_COMMANDS
+        else commands.when_mentioned
+    ),
+    intents=intents,
+    shard_count=SHARD_COUNT,
+    shard_ids=SHARD_IDS,
+)
 
 config_manager = ConfigManager()
 subscription_manager = SubscriptionManager()
 game_manager = GameManager()
 news_manager = NewsManager()
+outbox_manager = OutboxManager()
+embed_manager = EmbedManager(game_manager)
+webhook_manager = WebhookManager()
 
 
 async def load_cogs():
@@ -63,35 +92,57 @@ async def load_cogs():
 @bot.event
 async def on_ready():
     print(f"Logged in as {bot.user} (ID: {bot.user.id})")
+    print(f"Running shards {sorted(bot.shards)} of {bot.shard_count}.")
 
     # Call create_tables once at bot startup to ensure tables exist
-    from utils.bot_database import create_tables
+    from utils.bot_database import create_tables, run_db
 
-    create_tables()
+    await run_db(create_tables)
 
     print("\n--- Ensuring Guild Configurations ---")
-    for guild in bot.guilds:
-        await config_manager.get_or_create_guild_config(guild.id, guild.name)
-        print(f"Ensured config for guild: {guild.name} ({guild.id})")
+    await config_manager.warm_cache()
+    await config_manager.ensure_guild_configs(
+        (guild.id, guild.name) for guild in bot.guilds
+    )
+    await config_manager.sync_active_guilds(
+        (guild.id for guild in bot.guilds), ShardFilter.from_bot(bot)
+    )
+    print(f"Ensured config for {len(bot.guilds)} guilds.")
     print("--- Guild Configurations Ensured ---\n")
 
+    await subscription_manager.load_index()
+    await webhook_manager.load()
+
     await load_cogs()
 
+    synced = await bot.tree.sync()
+    print(f"Synced {len(synced)} slash commands.")
+
 
 @bot.event
 async def on_guild_join(guild):
     """Called when the bot joins a new guild."""
     print(f"Joined new guild: {guild.name} ({guild.id})")
     await config_manager.get_or_create_guild_config(guild.id, guild.name)
+    await config_manager.set_guild_active(guild.id, True)
     print(f"Created default config for new guild: {guild.name} ({guild.id})")
 
 
+@bot.event
+async def on_guild_remove(guild):
+    """Called when the bot leaves or is removed from a guild."""
+    print(f"Removed from guild: {guild.name} ({guild.id})")
+    await config_manager.set_guild_active(guild.id, False)
+
+
 @bot.event
 async def on_command_error(ctx, error):
     if isinstance(error, commands.MissingPermissions):
         await ctx.send("You don't have permission to do that. Shoo.")
     elif isinstance(error, commands.BotMissingPermissions):
         await ctx.send("Uh oh. I don't have permission to do that 🥲")
+    elif isinstance(error, commands.NoPrivateMessage):
+        await ctx.send("This command can only be used in a server.")
     elif isinstance(error, commands.CommandNotFound):
         await ctx.send("Unknown command. What are you even trying to do...?")
     elif isinstance(error, commands.MissingRequiredArgument):
@@ -110,4 +161,9 @@ async def on_command_error(ctx, error):
 
 
 if __name__ == "__main__":
-    bot.run(TOKEN)
+    from utils.bot_database import shutdown_db_executor
+
+    try:
+        bot.run(TOKEN)
+    finally:
+        shutdown_db_executor()
@@ -1,8 +1,19 @@
 # cogs/admin.py
+import logging
+from typing import Optional
+
 import discord
+from discord import app_commands
 from discord.ext import commands
 
 from bot import config_manager, game_manager
+from utils.config_manager import (
+    DIGEST_MAX_INTERVAL_MINUTES,
+    DIGEST_MIN_INTERVAL_MINUTES,
+)
+from utils.steam_api import steam_client
+
+logger = logging.getLogger(__name__)
 
 
 class AdminCommands(commands.Cog):
@@ -11,7 +22,8 @@ class AdminCommands(commands.Cog):
         Initializes the AdminCommands cog.
 
         This cog handles administrative commands for the bot, such as setting the
-        news channel and reloading game data from the database.
+        news channel, choosing digest mode or webhook delivery, and reloading
+        game data from the database.
 
         Args:
             bot (commands.Bot): The bot instance.
@@ -20,14 +32,20 @@ class AdminCommands(commands.Cog):
         self.config_manager = config_manager
         self.game_manager = game_manager
 
-    @commands.command(name="setchannel")
+    @commands.hybrid_command(name="setchannel")
+    @commands.guild_only()
     @commands.has_permissions(manage_guild=True)
+    @app_commands.default_permissions(manage_guild=True)
+    @app_commands.describe(
+        channel="The channel to post news in. Defaults to the current channel."
+    )
     async def setchannel(self, ctx, channel: discord.TextChannel = None):
         """
         Sets the news update channel for the server.
 
-        This command requires 'Manage Guild' permissions. The channel is saved
-        to the database for persistent storage.
+        This command requires 'Manage Guild' permissions and is available as a
+        slash command and a prefix command. The channel is saved to the database
+        for persistent storage.
 
         Args:
             ctx (commands.Contexdt): The context in which the command was called.
@@ -36,14 +54,109 @@ class AdminCommands(commands.Cog):
         guild_id = ctx.guild.id
         channel = channel or ctx.channel
 
-        if not ctx.guild:
-            await ctx.send("This command can only be used in a server.")
-            return
-
         await self.config_manager.set_guild_channel_id(guild_id, channel.id)
 
         await ctx.send(f"Set {channel.mention} as the update channel for this server.")
 
+    @commands.hybrid_command(name="digest")
+    @commands.guild_only()
+    @commands.has_permissions(manage_guild=True)
+    @app_commands.default_permissions(manage_guild=True)
+    @app_commands.describe(
+        enabled="Whether to post news as a periodic digest.",
+        interval_minutes="How many minutes of news each digest collects.",
+    )
+    async def digest(
+        self,
+        ctx,
+        enabled: Optional[bool] = None,
+        interval_minutes: Optional[int] = None,
+    ):
+        """
+        Shows or changes whether the server gets news as a periodic digest.
+
+        This command requires 'Manage Guild' permissions. In digest mode, news
+        is collected over a window and posted as one combined message when the
+        window closes, instead of one message per update. Without arguments,
+        it shows the current setting.
+
+        Args:
+            ctx (commands.Context): The context in which the command was called.
+            enabled (Optional[bool], optional): Whether to turn digest mode on or off.
+            interval_minutes (Optional[int], optional): The digest window in minutes. Defaults to keeping the current window.
+        """
+        guild_config = self.config_manager.get_guild_config(ctx.guild.id)
+
+        if enabled is None:
+            if guild_config is not None and guild_config.digest_enabled:
+                await ctx.send(
+                    f"News is posted as a digest every {guild_config.digest_interval} minutes."
+                )
+            else:
+                await ctx.send("News is posted as soon as it is published.")
+            return
+
+        if interval_minutes is not None and not (
+            DIGEST_MIN_INTERVAL_MINUTES
+            <= interval_minutes
+            <= DIGEST_MAX_INTERVAL_MINUTES
+        ):
+            await ctx.send(
+                f"The digest interval must be between {DIGEST_MIN_INTERVAL_MINUTES} and {DIGEST_MAX_INTERVAL_MINUTES} minutes."
+            )
+            return
+
+        guild_config = await self.config_manager.set_guild_digest(
+            ctx.guild.id, enabled, interval_minutes
+        )
+        if guild_config is None:
+            await ctx.send("Could not update the digest setting. Please try again.")
+        elif guild_config.digest_enabled:
+            await ctx.send(
+                f"News will be posted as a digest every {guild_config.digest_interval} minutes."
+            )
+        else:
+            await ctx.send("News will be posted as soon as it is published.")
+
+    @commands.hybrid_command(name="webhooks")
+    @commands.guild_only()
+    @commands.has_permissions(manage_guild=True)
+    @app_commands.default_permissions(manage_guild=True)
+    @app_commands.describe(enabled="Whether to post news through channel webhooks.")
+    async def webhooks(self, ctx, enabled: Optional[bool] = None):
+        """
+        Shows or changes whether the server gets news through webhooks.
+
+        This command requires 'Manage Guild' permissions. With webhook delivery,
+        the bot creates a webhook in each news channel and posts through it,
+        which keeps large news bursts clear of the bot's own rate limits. The
+        bot needs the 'Manage Webhooks' permission; without it, news is sent
+        as regular messages. Without arguments, it shows the current setting.
+
+        Args:
+            ctx (commands.Context): The context in which the command was called.
+            enabled (Optional[bool], optional): Whether to turn webhook delivery on or off.
+        """
+        if enabled is None:
+            guild_config = self.config_manager.get_guild_config(ctx.guild.id)
+            if guild_config is not None and guild_config.webhook_delivery:
+                await ctx.send("News is posted through channel webhooks.")
+            else:
+                await ctx.send("News is posted as regular bot messages.")
+            return
+
+        guild_config = await self.config_manager.set_guild_webhook_delivery(
+            ctx.guild.id, enabled
+        )
+        if guild_config is None:
+            await ctx.send("Could not update the webhook setting. Please try again.")
+        elif guild_config.webhook_delivery:
+            await ctx.send(
+                "News will be posted through channel webhooks. Make sure I have the Manage Webhooks permission."
+            )
+        else:
+            await ctx.send("News will be posted as regular bot messages.")
+
     @commands.command(name="reloadgames")
     @commands.is_owner()
     async def reload_games(self, ctx):
@@ -57,11 +170,51 @@ class AdminCommands(commands.Cog):
             ctx (commands.Context): The context in which the command was called.
         """
         try:
-            self.game_manager.load_games_from_db()
+            await self.game_manager.reload_games()
             await ctx.send("Game list reloaded from the database!")
         except Exception as e:
             await ctx.send(f"Failed to reload game list: {e}")
-            self.bot.logger.error(f"Error reloading game list: {e}", exc_info=True)
+            logger.error(f"Error reloading game list: {e}", exc_info=True)
+
+    @commands.command(name="importgames")
+    @commands.is_owner()
+    async def import_games(self, ctx, *, path: str):
+        """
+        Imports the Steam app catalogue from a local app list dump.
+
+        This command is restricted to the bot's owner. The file must be in the
+        JSON shape of ISteamApps/GetAppList and be readable by the bot process.
+
+        Args:
+            ctx (commands.Context): The context in which the command was called.
+            path (str): The path of the JSON dump on the bot's host.
+        """
+        await ctx.send(f"Importing games from `{path}`...")
+        try:
+            imported = await self.game_manager.import_app_list(path)
+            await ctx.send(f"Imported {imported} games.")
+        except Exception as e:
+            await ctx.send(f"Failed to import games: {e}")
+            logger.error(f"Error importing games from {path}: {e}", exc_info=True)
+
+    @commands.command(name="steamstatus")
+    @commands.is_owner()
+    async def steam_status(self, ctx):
+        """
+        Shows the health of the Steam API client.
+
+        This command is restricted to the bot's owner. It reports the circuit
+        breaker state and the request counters of each Steam endpoint.
+
+        Args:
+            ctx (commands.Context): The context in which the command was called.
+        """
+        health = steam_client.health()
+        lines = [f"Circuit: {health.pop('circuit')['state']}"]
+        for endpoint, counters in health.items():
+            stats = ", ".join(f"{name}={value}" for name, value in counters.items())
+            lines.append(f"{endpoint}: {stats}")
+        await ctx.send("\n".join(lines))
 
 
 async def setup(bot):
@@ -1,7 +1,99 @@
 # cogs/subscriptions.py
+from typing import List, Optional, Set
+
+import discord
+from discord import app_commands
 from discord.ext import commands
 
-from bot import game_manager, subscription_manager
+from bot import embed_manager, game_manager, news_manager, subscription_manager
+from utils.game_catalogue import SortedGames
+
+LIST_PAGE_SIZE = 20
+LIST_NAME_LENGTH = 80
+LIST_VIEW_TIMEOUT = 180
+
+
+class GameListView(discord.ui.View):
+    def __init__(
+        self, author_id: int, games: SortedGames, subscribed: Set[int], page: int = 0
+    ):
+        """
+        Initializes the Previous/Next buttons of a paginated game list.
+
+        Pages are rendered on demand from the sorted view, so turning a page
+        only looks up the names on that page.
+
+        Args:
+            author_id (int): The user who ran the command, the only one allowed to turn pages.
+            games (SortedGames): The games in name order.
+            subscribed (Set[int]): The app IDs the server is subscribed to.
+            page (int, optional): The zero-based page to start on. Defaults to 0.
+        """
+        super().__init__(timeout=LIST_VIEW_TIMEOUT)
+        self.author_id = author_id
+        self.games = games
+        self.subscribed = subscribed
+        self.page = min(max(page, 0), self.page_count - 1)
+        self.message: Optional[discord.Message] = None
+        self._update_buttons()
+
+    @property
+    def page_count(self) -> int:
+        return max(-(-len(self.games) // LIST_PAGE_SIZE), 1)
+
+    def render(self) -> str:
+        """
+        Builds the text of the current page.
+
+        Returns:
+            str: The page header followed by one line per game.
+        """
+        start = self.page * LIST_PAGE_SIZE
+        lines = [
+            f"{'✅' if appid in self.subscribed else '❌'} {game_name[:LIST_NAME_LENGTH]}"
+            for appid, game_name in self.games[start : start + LIST_PAGE_SIZE]
+        ]
+        header = f"Games available for subscription (page {self.page + 1}/{self.page_count}):"
+        return header + "\n" + "\n".join(lines)
+
+    def _update_buttons(self) -> None:
+        """Disables the buttons that would leave the list."""
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = self.page >= self.page_count - 1
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.author_id:
+            await interaction.response.send_message(
+                "Only the person who listed the games can turn the pages.",
+                ephemeral=True,
+            )
+            return False
+        return True
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary)
+    async def previous_page(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ):
+        self.page -= 1
+        self._update_buttons()
+        await interaction.response.edit_message(content=self.render(), view=self)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary)
+    async def next_page(
+        self, interaction: discord.Interaction, button: discord.ui.Button
+    ):
+        self.page += 1
+        self._update_buttons()
+        await interaction.response.edit_message(content=self.render(), view=self)
+
+    async def on_timeout(self) -> None:
+        for item in self.children:
+            item.disabled = True
+        if self.message is not None:
+            try:
+                await self.message.edit(view=self)
+            except discord.HTTPException:
+                pass
 
 
 class SubscriptionCommands(commands.Cog):
@@ -10,7 +102,10 @@ class SubscriptionCommands(commands.Cog):
         Initializes the SubscriptionCommands cog.
 
         This cog handles user-facing commands for managing game subscriptions,
-        including listing available games, subscribing, and unsubscribing.
+        including listing available games, subscribing, unsubscribing, and
+        showing a game's latest news. Each command is available both as a slash
+        command, with game names autocompleted from the in-memory catalogue,
+        and as a prefix command.
 
         Args:
             bot (commands.Bot): The bot instance.
@@ -18,42 +113,105 @@ class SubscriptionCommands(commands.Cog):
         self.bot = bot
         self.subscription_manager = subscription_manager
         self.game_manager = game_manager
+        self.news_manager = news_manager
+        self.embed_manager = embed_manager
 
-    @commands.command(name="listgames")
-    async def list_games(self, ctx):
+    def _not_found_message(self, game_name: str) -> str:
         """
-        Lists all trackable games and your server's subscription status.
+        Builds the reply for a game name that matches no game exactly.
+
+        Args:
+            game_name (str): The game name as the user typed it.
+
+        Returns:
+            str: A not-found message, with the closest game names if there are any.
+        """
+        suggestions = self.game_manager.suggest(game_name)
+        if not suggestions:
+            return f"Game '{game_name}' not found. Please check the spelling."
+
+        names = "\n".join(f"• {name}" for _, name in suggestions)
+        return f"Game '{game_name}' not found. Did you mean:\n{names}"
 
-        This command fetches the list of games from the in-memory cache and
-        compares it with the server's active subscriptions from the database.
+    async def game_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> List[app_commands.Choice[str]]:
+        """
+        Autocompletes a game name from the in-memory catalogue.
 
         Args:
-            ctx (commands.Context): The context in which the command was called.
+            interaction (discord.Interaction): The interaction being autocompleted.
+            current (str): What the user has typed so far.
+
+        Returns:
+            List[app_commands.Choice[str]]: Up to 25 matching game names.
         """
-        guild_id = ctx.guild.id
-        subs = await self.subscription_manager.get_subscriptions(guild_id)
+        return [
+            app_commands.Choice(name=name[:100], value=name[:100])
+            for _, name in self.game_manager.suggest(current, limit=25)
+        ]
 
-        lines = []
+    async def subscribed_game_autocomplete(
+        self, interaction: discord.Interaction, current: str
+    ) -> List[app_commands.Choice[str]]:
+        """
+        Autocompletes the name of a game the server is subscribed to.
 
-        sorted_games = sorted(
-            self.game_manager.appid_to_name.items(), key=lambda item: item[1].lower()
+        Args:
+            interaction (discord.Interaction): The interaction being autocompleted.
+            current (str): What the user has typed so far.
+
+        Returns:
+            List[app_commands.Choice[str]]: Up to 25 matching game names, in name order.
+        """
+        appids = await self.subscription_manager.get_subscriptions(interaction.guild_id)
+        current = current.lower()
+        names = sorted(
+            name
+            for name in map(self.game_manager.get_name, appids)
+            if current in name.lower()
         )
+        return [
+            app_commands.Choice(name=name[:100], value=name[:100])
+            for name in names[:25]
+        ]
+
+    @commands.hybrid_command(name="listgames")
+    @commands.guild_only()
+    @app_commands.describe(page="The page of the game list to show.")
+    async def list_games(self, ctx, page: int = 1):
+        """
+        Lists all trackable games and your server's subscription status.
 
-        for appid, game_name in sorted_games:
-            subscribed = "✅" if appid in subs else "❌"
-            lines.append(f"{subscribed} {game_name}")
+        This command pages through the game list in name order, served from a
+        cached, pre-sorted view of the in-memory catalogue, and compares it with
+        the server's active subscriptions. Only the requested page is built,
+        and Previous/Next buttons turn the pages.
 
-        if not lines:
-            message = "No games are currently available for subscription. Please contact an admin."
-        else:
-            message = "Games available for subscription:\n" + "\n".join(lines)
+        Args:
+            ctx (commands.Context): The context in which the command was called.
+            page (int, optional): The page to show. Defaults to 1.
+        """
+        games = self.game_manager.sorted_games()
+
+        if not games:
+            await ctx.send(
+                "No games are currently available for subscription. Please contact an admin."
+            )
+            return
+
+        subs = await self.subscription_manager.get_subscriptions(ctx.guild.id)
+        view = GameListView(ctx.author.id, games, set(subs), page - 1)
 
-        if len(message) > 2000:
-            await ctx.send("The list of games is too long. Please contact an admin. ")
+        if view.page_count == 1:
+            await ctx.send(view.render())
         else:
-            await ctx.send(message)
+            view.message = await ctx.send(view.render(), view=view)
 
-    @commands.command(name="subscribe")
+    @commands.hybrid_command(name="subscribe")
+    @commands.guild_only()
+    @app_commands.describe(game_name="The name of the game to subscribe to.")
+    @app_commands.autocomplete(game_name=game_autocomplete)
     async def subscribe(self, ctx, *, game_name: str):
         """
         Subscribes your server to receive news updates for a game.
@@ -68,7 +226,7 @@ class SubscriptionCommands(commands.Cog):
         appid = self.game_manager.get_appid_by_name(game_name)
 
         if appid is None:
-            await ctx.send(f"Game '{game_name}' not found. Please check the spelling.")
+            await ctx.send(self._not_found_message(game_name))
             return
 
         guild_id = ctx.guild.id
@@ -84,7 +242,10 @@ class SubscriptionCommands(commands.Cog):
                 f"Could not subscribe to {self.game_manager.get_name(appid)}. You might already be subscribed."
             )
 
-    @commands.command(name="unsubscribe")
+    @commands.hybrid_command(name="unsubscribe")
+    @commands.guild_only()
+    @app_commands.describe(game_name="The name of the game to unsubscribe from.")
+    @app_commands.autocomplete(game_name=subscribed_game_autocomplete)
     async def unsubscribe(self, ctx, *, game_name: str):
         """
         Unsubscribes your server from news updates for a game.
@@ -99,7 +260,7 @@ class SubscriptionCommands(commands.Cog):
         appid = self.game_manager.get_appid_by_name(game_name)
 
         if appid is None:
-            await ctx.send(f"Game '{game_name}' not found. Please check the spelling.")
+            await ctx.send(self._not_found_message(game_name))
             return
 
         guild_id = ctx.guild.id
@@ -115,6 +276,38 @@ class SubscriptionCommands(commands.Cog):
                 f"Could not unsubscribe to {self.game_manager.get_name(appid)}. You might not be subscribed."
             )
 
+    @commands.hybrid_command(name="latest")
+    @commands.guild_only()
+    @app_commands.describe(game_name="The name of the game to show news for.")
+    @app_commands.autocomplete(game_name=game_autocomplete)
+    async def latest(self, ctx, *, game_name: str):
+        """
+        Shows the most recent news for a game.
+
+        This command answers from the local news archive, so it responds
+        instantly and never calls the Steam API.
+
+        Args:
+            ctx (commands.Context): The context in which the command was called.
+            game_name (str): The name of the game to show news for.
+        """
+        appid = self.game_manager.get_appid_by_name(game_name)
+
+        if appid is None:
+            await ctx.send(self._not_found_message(game_name))
+            return
+
+        newsitems = await self.news_manager.get_archived_news(appid, limit=1)
+
+        if not newsitems:
+            await ctx.send(
+                f"No news has been archived for {self.game_manager.get_name(appid)} yet."
+            )
+            return
+
+        rendered = self.embed_manager.render_news(newsitems[0], appid)
+        await ctx.send(rendered.message, embed=rendered.embed)
+
 
 async def setup(bot):
     """
@@ -1,14 +1,35 @@
 # cogs/tasks.py
+import asyncio
+import functools
 import logging
+import os
+from typing import Dict, List
 
 import discord
 from discord.ext import commands, tasks
 
-from bot import config_manager, game_manager, news_manager, subscription_manager
-from utils.embed_manager import EmbedManager
+from bot import (
+    config_manager,
+    embed_manager,
+    game_manager,
+    news_manager,
+    outbox_manager,
+    subscription_manager,
+    webhook_manager,
+)
+from utils.delivery_scheduler import DeliveryScheduler
+from utils.message_packer import OutgoingMessage, pack_digest, pack_messages
+from utils.news_poller import POLL_TICK_SECONDS, NewsPoller
+from utils.outbox_manager import OutboxDelivery
+from utils.sharding import ShardFilter
 
 logger = logging.getLogger(__name__)
-embed_manager = EmbedManager(game_manager)
+
+# Polls Steam from the bot process. Turn off when a standalone `poller.py`
+# worker fills the outbox, so the bot only delivers.
+EMBEDDED_POLLER = os.getenv("EMBEDDED_POLLER", "true").lower() == "true"
+OUTBOX_POLL_SECONDS = int(os.getenv("OUTBOX_POLL_SECONDS", "10"))
+OUTBOX_BATCH_SIZE = int(os.getenv("OUTBOX_BATCH_SIZE", "500"))
 
 
 class UpdateChecker(commands.Cog):
@@ -16,8 +37,11 @@ class UpdateChecker(commands.Cog):
         """
         Initializes the UpdateChecker cog.
 
-        This cog handles the bot's primary recurring rask of checking for and
-        sending new game news updates to subscribed guilds.
+        This cog handles the bot's primary recurring rask of checking for new
+        game news and queueing it in the delivery outbox, and the background
+        sender that drains the outbox to subscribed guilds. When
+        `EMBEDDED_POLLER` is off, news is polled by a separate worker process
+        and this cog only drains the outbox.
 
         Args:
             bot (commands.Bot): The bot instance.
@@ -26,107 +50,340 @@ class UpdateChecker(commands.Cog):
         self.config_manager = config_manager
         self.subscription_manager = subscription_manager
         self.news_manager = news_manager
+        self.outbox_manager = outbox_manager
         self.embed_manager = embed_manager
         self.game_manager = game_manager
+        self.webhook_manager = webhook_manager
+        self.delivery_scheduler = DeliveryScheduler()
+        self.news_poller = NewsPoller(
+            subscription_manager, news_manager, game_manager, outbox_manager
+        )
 
-        self.check_for_updates.start()
+        if EMBEDDED_POLLER:
+            self.check_for_updates.start()
+        else:
+            logger.info(
+                "Embedded poller is off. Delivering news queued by the standalone poller."
+            )
+        self.send_pending_deliveries.start()
+        self.purge_outbox.start()
 
-    def cog_unload(self):
+    async def cog_unload(self):
         """
         Performs cleanup when the cog is unloaded.
 
-        This method ensures the background task is properly cancelled to
-        prevent it from running after the bot shuts down.
+        This method ensures the background tasks are properly cancelled to
+        prevent them from running after the bot shuts down, flushes any buffered
+        news GIDs, and closes the pooled Steam API and webhook connections.
         """
         self.check_for_updates.cancel()
+        self.send_pending_deliveries.cancel()
+        self.purge_outbox.cancel()
+        await self.delivery_scheduler.stop()
+        await self.news_manager.flush_last_news_ids()
+        await self.news_manager.close()
+        await self.webhook_manager.close()
 
-    @tasks.loop(minutes=15)
+    @tasks.loop(seconds=POLL_TICK_SECONDS)
     async def check_for_updates(self):
         """
-        Periodically checks for new game news for subscribed guilds.
+        Polls every subscribed game whose next check is due and queues its news.
 
-        This task runs every 15 minutes, iterates through all guilds, and
-        sends news updates for any subscribed games that have new news.
+        The polling itself is done by the `NewsPoller`. Only games followed by
+        guilds on this process's shards are polled, and only those guilds'
+        subscriptions are queued, so several processes can each run a subset
+        of the shards. This loop only runs when `EMBEDDED_POLLER` is on; with
+        it off, a standalone `poller.py` worker fills the outbox instead.
         """
 
         await self.bot.wait_until_ready()
         if not self.bot.is_ready():
             return
 
-        for guild in self.bot.guilds:
-            try:
-                channel_id = await self.config_manager.get_guild_channel_id(guild.id)
-                if not channel_id:
-                    logger.debug(
-                        f"Guild {guild.name} ({guild.id}) has no update channel configured. Skipping."
-                    )
-                    continue
-
-                channel = self.bot.get_channel(channel_id)
-                if not channel:
-                    logger.warning(
-                        f"Configured channel {channel_id} not found for guild {guild.name} ({guild.id}. Skipping.)"
-                    )
-                    continue
-
-                subscribed_appids = await self.subscription_manager.get_subscriptions(
-                    guild.id
+        await self.news_poller.tick(
+            ShardFilter.from_bot(self.bot),
+            lambda guild_id: self.bot.get_guild(guild_id) is not None,
+        )
+
+    @check_for_updates.before_loop
+    async def seed_poll_scheduler(self):
+        """Restores each game's polling schedule from the `games` table before the first poll."""
+        await self.bot.wait_until_ready()
+        await self.news_poller.seed()
+
+    @tasks.loop(seconds=OUTBOX_POLL_SECONDS)
+    async def send_pending_deliveries(self):
+        """
+        Drains the delivery outbox, sending the due news items to their channels.
+
+        Each batch of due deliveries is grouped by destination channel, and the
+        news headed to one channel is combined into as few messages as
+        Discord's limits allow, up to ten embeds each. Guilds in digest mode
+        have their deliveries held until their window closes, and then get
+        one combined digest, paginated across messages if needed. The messages
+        are handed to the `DeliveryScheduler`, which sends to many channels
+        concurrently within Discord's rate limits; guilds with webhook delivery
+        are posted through channel webhooks, outside the bot-wide limit.
+        Deliveries whose message is confirmed are marked as sent and their
+        subscription's last sent GID is advanced in one batched write. Failed
+        sends stay in the outbox and are retried with backoff, so a Discord
+        error or a restart never loses a news item. A delivery that is given
+        up on advances the last sent GID too, so a guild whose channel is gone
+        does not keep its games' news window open.
+
+        The outbox is partitioned by shard: each shard this process runs drains
+        only its own guilds' deliveries, concurrently with the others, and a
+        shard whose gateway connection is down is skipped until it reconnects.
+        """
+
+        await self.bot.wait_until_ready()
+
+        shards = ShardFilter.from_bot(self.bot)
+        await asyncio.gather(
+            *(
+                self._drain_shard(shard_id, shards.shard_count)
+                for shard_id in sorted(shards.shard_ids)
+            )
+        )
+
+    async def _drain_shard(self, shard_id: int, shard_count: int) -> None:
+        """
+        Drains the due deliveries of the guilds on one shard.
+
+        Args:
+            shard_id (int): The shard to drain.
+            shard_count (int): The total number of shards.
+        """
+        shard = self.bot.get_shard(shard_id)
+        if shard is not None and shard.is_closed():
+            logger.debug(f"Shard {shard_id} is disconnected. Skipping its outbox.")
+            return
+
+        shards = ShardFilter.for_shards(shard_count, [shard_id])
+        try:
+            while await self._send_due_batch(shards):
+                pass
+        except Exception as e:
+            logger.error(
+                f"Failed to drain the delivery outbox of shard {shard_id}: {e}",
+                exc_info=True,
+            )
+
+    async def _send_due_batch(self, shards: ShardFilter) -> bool:
+        """
+        Sends one batch of due deliveries and records the outcome.
+
+        Args:
+            shards (ShardFilter): The shards whose guilds' deliveries are sent.
+
+        Returns:
+            bool: True if the batch was full and more deliveries may be due.
+        """
+        deliveries = await self.outbox_manager.get_due(
+            limit=OUTBOX_BATCH_SIZE, shards=shards
+        )
+        if not deliveries:
+            return False
+
+        by_channel: Dict[int, List[OutboxDelivery]] = {}
+        for delivery in deliveries:
+            by_channel.setdefault(delivery.channel_id, []).append(delivery)
+
+        messages = []
+        for channel_id, group in by_channel.items():
+            digest = [d for d in group if self._wants_digest(d.guild_id)]
+            realtime = [d for d in group if not self._wants_digest(d.guild_id)]
+            messages.extend(self._pack_digest(digest))
+            messages.extend(self._pack_messages(realtime))
+
+        sent: List[OutboxDelivery] = []
+        futures = []
+        for message in messages:
+            via_webhook = self._wants_webhook(message.deliveries[0].guild_id)
+            futures.append(
+                self.delivery_scheduler.submit(
+                    message.deliveries[0].channel_id,
+                    functools.partial(self._send_message, message, via_webhook, sent),
+                    global_limited=not via_webhook,
                 )
+            )
+        await asyncio.gather(*futures)
+
+        sent_ids = {delivery.delivery_id for delivery in sent}
+        failed = [d for d in deliveries if d.delivery_id not in sent_ids]
 
-                if not subscribed_appids:
-                    logger.debug(
-                        f"Guild {guild.name} ({guild.id}) has no active subscriptions. Skipping."
-                    )
-                    continue
-
-                for appid in subscribed_appids:
-                    newsitems = self.news_manager.fetch_latest_news(appid, count=1)
-                    if not newsitems:
-                        logger.debug(
-                            f"No new news for appid {appid} for guild {guild.id}."
-                        )
-                        continue
-
-                    latest_news = newsitems[0]
-                    latest_news_gid = int(latest_news["gid"])
-
-                    last_gid_stored = await self.news_manager.get_last_news_id(
-                        guild.id, appid
-                    )
-
-                    if last_gid_stored and latest_news_gid <= last_gid_stored:
-                        logger.debug(
-                            f"News GID {latest_news_gid} for appid {appid} is not newer than stored {last_gid_stored} for guild {guild.id}. Skipping."
-                        )
-                        continue
-
-                    await self.news_manager.save_last_news_id(
-                        guild.id, appid, str(latest_news_gid)
-                    )
-
-                    embed = self.embed_manager.format_news_embed(latest_news, appid)
-                    message = self.embed_manager.get_news_message(latest_news, appid)
-
-                    try:
-                        await channel.send(message, embed=embed)
-                        logger.info(
-                            f"Sent new news for appid {appid} (GID: {latest_news_gid}) to guild {guild.id}."
-                        )
-                    except discord.Forbidden:
-                        logger.warning(
-                            f"Bot lacks permissions to send messages to channel {channel.name} ({channel.id}) in guild {guild.name} ({guild.id})."
-                        )
-                    except discord.HTTPException as http_exc:
-                        logger.error(
-                            f"Failed to send message to guild {guild.id} channel {channel.id}: {http_exc}",
-                            exc_info=True,
-                        )
-
-            except Exception as e:
-                logger.error(
-                    f"Unhandled exception in check_for_updates for guild {guild.id}: {e}",
-                    exc_info=True,
+        logger.info(
+            f"Delivered {len(sent)} of {len(deliveries)} queued news items to {len(by_channel)} channels in {len(messages)} messages. Scheduler stats: {self.delivery_scheduler.stats()}"
+        )
+
+        await self.outbox_manager.mark_sent([d.delivery_id for d in sent])
+        given_up = await self.outbox_manager.reschedule(failed)
+        # Deliveries that were given up on still advance their subscription's
+        # last sent GID. Otherwise the news window of their app would stay
+        # wide open, and the items would be queued again once purged.
+        for delivery in sent + given_up:
+            self.news_manager.queue_last_news_id(
+                delivery.guild_id, delivery.appid, str(delivery.news_gid)
+            )
+        await self.news_manager.flush_last_news_ids()
+        if not EMBEDDED_POLLER:
+            # News was archived by the poller process, so keep this process's
+            # cache fresh for `latest` with what was just delivered.
+            sent_news: Dict[int, List[dict]] = {}
+            for delivery in sent:
+                sent_news.setdefault(delivery.appid, []).append(delivery.news_item)
+            self.news_manager.refresh_cached_news(sent_news)
+
+        return len(deliveries) == OUTBOX_BATCH_SIZE
+
+    def _wants_digest(self, guild_id: int) -> bool:
+        """Reports whether a guild has digest mode turned on."""
+        guild_config = self.config_manager.get_guild_config(guild_id)
+        return guild_config is not None and guild_config.digest_enabled
+
+    def _wants_webhook(self, guild_id: int) -> bool:
+        """Reports whether a guild has webhook delivery turned on."""
+        guild_config = self.config_manager.get_guild_config(guild_id)
+        return guild_config is not None and guild_config.webhook_delivery
+
+    def _pack_messages(self, deliveries: List[OutboxDelivery]) -> List[OutgoingMessage]:
+        """Splits the deliveries headed to one channel into messages, within Discord's limits."""
+        return pack_messages(deliveries, self.embed_manager.render_news)
+
+    def _pack_digest(self, deliveries: List[OutboxDelivery]) -> List[OutgoingMessage]:
+        """Combines the deliveries headed to one channel into one digest message per page."""
+        return pack_digest(deliveries, self.embed_manager.format_digest_pages)
+
+    @tasks.loop(hours=1)
+    async def purge_outbox(self):
+        """Deletes old sent and failed deliveries from the outbox."""
+        purged = await self.outbox_manager.purge()
+        if purged:
+            logger.info(f"Purged {purged} old deliveries from the outbox.")
+
+    async def _send_message(
+        self,
+        message: OutgoingMessage,
+        via_webhook: bool,
+        sent: List[OutboxDelivery],
+    ) -> bool:
+        """
+        Sends one packed message to the channel its deliveries share.
+
+        With webhook delivery, the message is posted through the channel's
+        webhook, falling back to a regular message when the channel has no
+        usable webhook. If Discord rejects a message carrying several news
+        items as invalid, the items are sent one by one instead, so one bad
+        item does not hold back the others.
+
+        Args:
+            message (OutgoingMessage): The message and the deliveries it carries.
+            via_webhook (bool): Whether to post through the channel's webhook.
+            sent (List[OutboxDelivery]): Collects the deliveries Discord confirmed.
+
+        Returns:
+            bool: True if every delivery was confirmed, False if some should be retried.
+        """
+        first = message.deliveries[0]
+        channel = self.bot.get_channel(first.channel_id)
+        if not channel:
+            logger.warning(
+                f"Configured channel {first.channel_id} not found for guild {first.guild_id}. Will retry."
+            )
+            return False
+
+        try:
+            await self._post(channel, message, via_webhook)
+        except discord.HTTPException as http_exc:
+            if http_exc.status == 400 and len(message.deliveries) > 1:
+                logger.warning(
+                    f"Discord rejected {len(message.deliveries)} combined news items for channel {channel.id} in guild {first.guild_id}: {http_exc}. Sending them one by one."
+                )
+                return await self._send_individually(
+                    channel, message, via_webhook, sent
+                )
+            self._log_send_error(channel, first.guild_id, http_exc)
+            return False
+
+        sent.extend(message.deliveries)
+        return True
+
+    async def _send_individually(
+        self,
+        channel: discord.abc.Messageable,
+        message: OutgoingMessage,
+        via_webhook: bool,
+        sent: List[OutboxDelivery],
+    ) -> bool:
+        """Sends each delivery of a rejected packed message as its own message."""
+        delivered_all = True
+        for delivery in message.deliveries:
+            if self._wants_digest(delivery.guild_id):
+                single = self._pack_digest([delivery])[0]
+            else:
+                single = self._pack_messages([delivery])[0]
+            if not via_webhook:
+                # The scheduler only took a token for the first send.
+                await self.delivery_scheduler.global_bucket.acquire()
+            try:
+                await self._post(channel, single, via_webhook)
+                sent.append(delivery)
+            except discord.HTTPException as http_exc:
+                self._log_send_error(channel, delivery.guild_id, http_exc)
+                delivered_all = False
+        return delivered_all
+
+    async def _post(
+        self,
+        channel: discord.abc.Messageable,
+        message: OutgoingMessage,
+        via_webhook: bool,
+    ) -> None:
+        """
+        Posts a message through the channel's webhook or as a regular message.
+
+        Args:
+            channel (discord.abc.Messageable): The channel to post in.
+            message (OutgoingMessage): The message and the deliveries it carries.
+            via_webhook (bool): Whether to post through the channel's webhook.
+
+        Raises:
+            discord.HTTPException: If Discord rejected the message.
+        """
+        guild_id = message.deliveries[0].guild_id
+        if via_webhook:
+            if await self.webhook_manager.send(
+                channel, message.content, message.embeds
+            ):
+                logger.info(
+                    f"Posted {len(message.deliveries)} news items through the webhook of channel {channel.id} in guild {guild_id}."
                 )
+                return
+            # The fallback uses the bot's token, so it counts against the
+            # global limit this send was submitted without.
+            await self.delivery_scheduler.global_bucket.acquire()
+
+        await channel.send(message.content, embeds=message.embeds)
+        logger.info(
+            f"Sent {len(message.deliveries)} news items to channel {channel.id} in guild {guild_id}: {', '.join(f'{d.appid}/{d.news_gid}' for d in message.deliveries)}."
+        )
+
+    @staticmethod
+    def _log_send_error(
+        channel: discord.abc.Messageable,
+        guild_id: int,
+        http_exc: discord.HTTPException,
+    ) -> None:
+        """Logs a message Discord did not accept."""
+        if isinstance(http_exc, discord.Forbidden):
+            logger.warning(
+                f"Bot lacks permissions to send messages to channel {channel.name} ({channel.id}) in guild {guild_id}."
+            )
+        else:
+            logger.error(
+                f"Failed to send message to guild {guild_id} channel {channel.id}: {http_exc}",
+                exc_info=True,
+            )
 
 
 async def setup(bot):
@@ -0,0 +1,83 @@
+# poller.py
+"""
+Standalone Steam news poller.
+
+Runs the polling half of the bot in its own process: it polls the Steam API
+for every subscribed game and queues new news items in the delivery outbox,
+which the bot drains. Start it with `python poller.py` (or `python -m poller`)
+and run the bot with `EMBEDDED_POLLER=false`, so Steam latency and load never
+reach the bot's event loop.
+"""
+
+import asyncio
+import logging
+import os
+from logging.handlers import RotatingFileHandler
+
+from dotenv import load_dotenv
+
+from utils.bot_database import create_tables, run_db, shutdown_db_executor
+from utils.game_manager import GameManager
+from utils.news_manager import NewsManager
+from utils.news_poller import POLL_TICK_SECONDS, NewsPoller
+from utils.outbox_manager import OutboxManager
+from utils.subscription_manager import SubscriptionManager
+
+# --- Set up logging ---
+os.makedirs("logs", exist_ok=True)
+
+root_logger = logging.getLogger()
+root_logger.setLevel(logging.INFO)
+
+formatter = logging.Formatter("%(asctime)s:%(levelname)s:%(name)s: %(message)s")
+
+error_handler = RotatingFileHandler(
+    "logs/error.log", maxBytes=5 * 1024 * 1024, backupCount=5, encoding="utf-8"
+)
+error_handler.setLevel(logging.ERROR)
+error_handler.setFormatter(formatter)
+root_logger.addHandler(error_handler)
+
+poller_log_handler = RotatingFileHandler(
+    "logs/poller.log", maxBytes=10 * 1024 * 1024, backupCount=3, encoding="utf-8"
+)
+poller_log_handler.setLevel(logging.INFO)
+poller_log_handler.setFormatter(formatter)
+root_logger.addHandler(poller_log_handler)
+
+logger = logging.getLogger("poller")
+
+load_dotenv()
+
+
+async def run_poller() -> None:
+    """Polls for news every `POLL_TICK_SECONDS` until the process is stopped."""
+    await run_db(create_tables)
+
+    # The poller never looks up game names or reads archived news, so it
+    # skips the game catalogue and the archive cache.
+    news_manager = NewsManager(cache_archive=False)
+    poller = NewsPoller(
+        SubscriptionManager(),
+        news_manager,
+        GameManager(load_catalogue=False),
+        OutboxManager(),
+    )
+    await poller.seed()
+    logger.info(f"Poller started, checking for due games every {POLL_TICK_SECONDS}s.")
+
+    try:
+        while True:
+            await poller.tick()
+            await asyncio.sleep(POLL_TICK_SECONDS)
+    finally:
+        await news_manager.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(run_poller())
+    except KeyboardInterrupt:
+        logger.info("Poller stopped.")
+    finally:
+        shutdown_db_executor()
@@ -0,0 +1,49 @@
+import json
+
+import pytest
+
+from utils import app_list
+from utils.app_list import iter_app_list
+
+APPS = [
+    {"appid": 10, "name": "Counter-Strike"},
+    {"appid": 20, "name": 'Team "Fortress" [Classic]'},
+    {"appid": 30, "name": "apps, {braces} and ]brackets["},
+    {"appid": 40, "name": "Ōkami HD"},
+    {"appid": 50, "name": ""},
+]
+
+
+def write(tmp_path, payload):
+    path = tmp_path / "app_list.json"
+    path.write_text(payload, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("read_size", [1, 3, 7, 64, 1 << 16])
+def test_streams_every_entry_across_read_boundaries(tmp_path, monkeypatch, read_size):
+    monkeypatch.setattr(app_list, "_READ_SIZE", read_size)
+    path = write(tmp_path, json.dumps({"applist": {"apps": APPS}}, indent=2))
+    assert list(iter_app_list(path)) == APPS
+
+
+def test_compact_json(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_list, "_READ_SIZE", 5)
+    payload = json.dumps({"applist": {"apps": APPS}}, separators=(",", ":"))
+    assert list(iter_app_list(write(tmp_path, payload))) == APPS
+
+
+def test_empty_app_list(tmp_path):
+    assert list(iter_app_list(write(tmp_path, '{"applist": {"apps": []}}'))) == []
+
+
+def test_missing_apps_key(tmp_path):
+    assert list(iter_app_list(write(tmp_path, '{"applist": {}}'))) == []
+    assert list(iter_app_list(write(tmp_path, ""))) == []
+
+
+def test_truncated_file_raises(tmp_path, monkeypatch):
+    monkeypatch.setattr(app_list, "_READ_SIZE", 8)
+    payload = json.dumps({"applist": {"apps": APPS}})[:-30]
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_app_list(write(tmp_path, payload)))
@@ -0,0 +1,115 @@
+import asyncio
+
+from utils.delivery_scheduler import DeliveryScheduler
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, timeout=5))
+
+
+def test_sends_to_one_channel_run_in_order():
+    async def main():
+        scheduler = DeliveryScheduler(workers=4, global_rate=1000)
+        order, running = [], []
+
+        def send(i):
+            async def go():
+                running.append(i)
+                assert len(running) == 1
+                await asyncio.sleep(0.001)
+                order.append(i)
+                running.remove(i)
+                return True
+
+            return go
+
+        futures = [scheduler.submit(1, send(i)) for i in range(10)]
+        results = await asyncio.gather(*futures)
+        await scheduler.stop()
+        return order, results, scheduler.stats()
+
+    order, results, stats = run(main())
+    assert order == list(range(10))
+    assert all(results)
+    assert stats["sent"] == 10 and stats["queue_depth"] == 0 and stats["channels"] == 0
+
+
+def test_busy_channel_does_not_hold_other_workers():
+    async def main():
+        scheduler = DeliveryScheduler(workers=2, global_rate=1000)
+        release = asyncio.Event()
+
+        async def blocked():
+            await release.wait()
+            return True
+
+        async def quick():
+            return True
+
+        busy = [scheduler.submit(1, blocked) for _ in range(3)]
+        other = scheduler.submit(2, quick)
+        # Only one worker may wait on channel 1, so channel 2 is sent now.
+        assert await asyncio.wait_for(other, timeout=1)
+        assert scheduler.stats()["in_flight"] == 1
+
+        release.set()
+        assert all(await asyncio.gather(*busy))
+        await scheduler.stop()
+
+    run(main())
+
+
+def test_failures_resolve_false():
+    async def main():
+        scheduler = DeliveryScheduler(workers=1, global_rate=1000)
+
+        async def fails():
+            return False
+
+        async def raises():
+            raise RuntimeError("boom")
+
+        results = await asyncio.gather(
+            scheduler.submit(1, fails), scheduler.submit(1, raises)
+        )
+        await scheduler.stop()
+        return results, scheduler.failed
+
+    assert run(main()) == ([False, False], 2)
+
+
+def test_webhook_sends_skip_global_bucket():
+    async def main():
+        scheduler = DeliveryScheduler(workers=2, global_rate=1)
+        await scheduler.global_bucket.acquire(1)
+
+        async def send():
+            return True
+
+        results = await asyncio.gather(
+            *(scheduler.submit(i, send, global_limited=False) for i in range(5))
+        )
+        await scheduler.stop()
+        return results
+
+    assert all(run(main()))
+
+
+def test_stop_resolves_queued_sends():
+    async def main():
+        scheduler = DeliveryScheduler(workers=1, global_rate=1000)
+        started = asyncio.Event()
+
+        async def hangs():
+            started.set()
+            await asyncio.Event().wait()
+
+        futures = [scheduler.submit(1, hangs) for _ in range(3)]
+        futures.append(scheduler.submit(2, hangs))
+        await started.wait()
+        await scheduler.stop()
+        return await asyncio.gather(*futures), scheduler.stats()
+
+    results, stats = run(main())
+    assert results == [False] * 4
+    assert stats["queue_depth"] == 0 and stats["channels"] == 0
@@ -0,0 +1,144 @@
+import pytest
+
+from utils import game_catalogue
+from utils.game_catalogue import GameCatalogue
+
+GAMES = [
+    (440, "Team Fortress 2"),
+    (10, "Counter-Strike"),
+    (570, "Dota 2"),
+    (620, "Portal 2"),
+    (400, "Portal"),
+    (367520, "Hollow Knight"),
+]
+
+
+@pytest.fixture
+def catalogue():
+    return GameCatalogue(GAMES)
+
+
+def test_mapping_interface(catalogue):
+    assert catalogue[440] == "Team Fortress 2"
+    assert 570 in catalogue
+    assert 999 not in catalogue
+    assert "440" not in catalogue
+    assert len(catalogue) == len(GAMES)
+    assert sorted(catalogue) == sorted(appid for appid, _ in GAMES)
+    assert catalogue.get(999, "Unknown Game") == "Unknown Game"
+    with pytest.raises(KeyError):
+        catalogue[999]
+
+
+def test_appid_for_name_ignores_case(catalogue):
+    assert catalogue.appid_for_name("portal") == 400
+    assert catalogue.appid_for_name("PORTAL 2") == 620
+    assert catalogue.appid_for_name("Portal 3") is None
+
+
+def test_non_ascii_names():
+    catalogue = GameCatalogue([(1, "Ōkami HD"), (2, "Café Manager")])
+    assert catalogue[1] == "Ōkami HD"
+    assert catalogue.appid_for_name("café manager") == 2
+
+
+def test_update_adds_to_overlay(catalogue):
+    catalogue.update_games([(730, "Counter-Strike 2")])
+    assert catalogue[730] == "Counter-Strike 2"
+    assert catalogue.appid_for_name("counter-strike 2") == 730
+    assert len(catalogue) == len(GAMES) + 1
+    assert 730 in set(catalogue)
+
+
+def test_rename_supersedes_compacted_name(catalogue):
+    catalogue.update_games([(570, "Dota Two")])
+    assert catalogue[570] == "Dota Two"
+    assert catalogue.appid_for_name("Dota Two") == 570
+    assert catalogue.appid_for_name("Dota 2") is None
+    assert len(catalogue) == len(GAMES)
+    assert list(catalogue).count(570) == 1
+
+
+def test_rename_within_overlay(catalogue):
+    catalogue.update_games([(730, "CS2")])
+    catalogue.update_games([(730, "Counter-Strike 2")])
+    assert catalogue.appid_for_name("Counter-Strike 2") == 730
+    assert catalogue.appid_for_name("CS2") is None
+
+
+def test_compact_keeps_contents(catalogue):
+    catalogue.update_games([(730, "Counter-Strike 2"), (570, "Dota Two")])
+    before = dict(catalogue)
+    catalogue.compact()
+    assert dict(catalogue) == before
+    assert catalogue.appid_for_name("Dota Two") == 570
+    assert catalogue.appid_for_name("Dota 2") is None
+
+
+def test_large_overlay_compacts_automatically(monkeypatch):
+    monkeypatch.setattr(game_catalogue, "COMPACT_MIN_OVERLAY", 4)
+    catalogue = GameCatalogue(GAMES)
+    catalogue.update_games((appid, f"Game {appid}") for appid in range(1000, 1005))
+    assert not catalogue._overlay
+    assert len(catalogue) == len(GAMES) + 5
+    assert catalogue.appid_for_name("game 1003") == 1003
+
+
+def test_prefix_search(catalogue):
+    catalogue.update_games([(401, "Portal Stories: Mel"), (620, "Renamed")])
+    assert catalogue.prefix_search("portal") == [
+        (400, "Portal"),
+        (401, "Portal Stories: Mel"),
+    ]
+    assert catalogue.prefix_search("portal", limit=1) == [(400, "Portal")]
+    assert catalogue.prefix_search("zzz") == []
+
+    # A re-import puts unchanged names in the overlay too.
+    catalogue.update_games([(10, "Counter-Strike")])
+    assert catalogue.prefix_search("count") == [(10, "Counter-Strike")]
+
+
+def test_suggest_ranks_exact_then_prefix_then_fuzzy(catalogue):
+    catalogue.build_search_index()
+    assert catalogue.suggest("portal", limit=2) == [(400, "Portal"), (620, "Portal 2")]
+    assert catalogue.suggest("holow knigt") == [(367520, "Hollow Knight")]
+    assert catalogue.suggest("   ") == []
+
+
+def test_suggest_without_index_only_searches_overlay(catalogue):
+    catalogue.update_games([(730, "Counter-Strike 2")])
+    assert catalogue.suggest("holow knigt") == []
+    assert catalogue.suggest("countr-strike 2")[0] == (730, "Counter-Strike 2")
+    assert catalogue._search[1] is None
+
+
+def test_suggest_skips_names_renamed_since_indexing(catalogue):
+    catalogue.build_search_index()
+    catalogue.update_games([(367520, "Silksong")])
+    assert catalogue.suggest("holow knigt") == []
+    assert catalogue.suggest("silksog") == [(367520, "Silksong")]
+
+
+def test_compact_rebuilds_existing_index(catalogue):
+    catalogue.build_search_index()
+    catalogue.update_games([(1145360, "Hades")])
+    catalogue.compact()
+    assert catalogue._search[0] is catalogue._data
+    assert catalogue.suggest("hadse") == [(1145360, "Hades")]
+
+
+def test_sorted_view_merges_overlay(catalogue):
+    catalogue.update_games([(730, "counter-strike 2"), (570, "Zeta")])
+    view = catalogue.sorted_view()
+    names = [name for _, name in view]
+    assert names == sorted(names, key=str.lower)
+    assert (570, "Zeta") == view[-1]
+    assert len(view) == len(catalogue)
+    assert view[:2] == [(10, "Counter-Strike"), (730, "counter-strike 2")]
+
+
+def test_sorted_view_is_cached_until_change(catalogue):
+    view = catalogue.sorted_view()
+    assert catalogue.sorted_view() is view
+    catalogue.update_games([(730, "Counter-Strike 2")])
+    assert catalogue.sorted_view() is not view
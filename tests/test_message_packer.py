@@ -0,0 +1,94 @@
+from typing import NamedTuple
+
+from utils.message_packer import (
+    MAX_EMBEDS_PER_MESSAGE,
+    MAX_MESSAGE_CHARS,
+    pack_digest,
+    pack_messages,
+)
+
+
+class Delivery(NamedTuple):
+    id: int
+    appid: int
+    news_item: dict
+
+
+class Rendered(NamedTuple):
+    message: str
+    embed: str
+
+
+class Page(NamedTuple):
+    message: str
+    embed: str
+    size: int
+
+
+def deliveries(count, message="", embed_size=100):
+    return [
+        Delivery(i, 440, {"gid": str(i), "message": message, "embed_size": embed_size})
+        for i in range(count)
+    ]
+
+
+def render(news_item, appid):
+    return Rendered(
+        news_item["message"] or news_item["gid"], "x" * news_item["embed_size"]
+    )
+
+
+def ids(message):
+    return [delivery.id for delivery in message.deliveries]
+
+
+def test_single_message():
+    messages = pack_messages(deliveries(3), render)
+    assert len(messages) == 1
+    assert ids(messages[0]) == [0, 1, 2]
+    assert messages[0].content == "0\n1\n2"
+    assert len(messages[0].embeds) == 3
+
+
+def test_splits_on_embed_count():
+    messages = pack_messages(deliveries(MAX_EMBEDS_PER_MESSAGE * 2 + 1), render)
+    assert [len(m.embeds) for m in messages] == [10, 10, 1]
+    assert sum((ids(m) for m in messages), []) == list(range(21))
+
+
+def test_splits_on_embed_characters():
+    messages = pack_messages(deliveries(5, embed_size=2500), render)
+    assert [ids(m) for m in messages] == [[0, 1], [2, 3], [4]]
+
+
+def test_splits_on_content_length():
+    messages = pack_messages(deliveries(4, message="m" * 700), render)
+    assert [ids(m) for m in messages] == [[0, 1], [2, 3]]
+    assert all(len(m.content) <= MAX_MESSAGE_CHARS for m in messages)
+
+
+def test_oversized_item_gets_its_own_message():
+    items = deliveries(3)
+    items[1] = items[1]._replace(news_item={**items[1].news_item, "embed_size": 7000})
+    messages = pack_messages(items, render)
+    assert [ids(m) for m in messages] == [[0], [1], [2]]
+
+
+def test_no_deliveries():
+    assert pack_messages([], render) == []
+    assert pack_digest([], lambda items: []) == []
+
+
+def test_digest_assigns_deliveries_to_pages():
+    seen = []
+
+    def format_pages(items):
+        seen.extend(items)
+        return [Page("page 1", "a", 3), Page("page 2", "b", 2)]
+
+    items = deliveries(5)
+    messages = pack_digest(items, format_pages)
+    assert seen == [(item.news_item, item.appid) for item in items]
+    assert [ids(m) for m in messages] == [[0, 1, 2], [3, 4]]
+    assert [m.content for m in messages] == ["page 1", "page 2"]
+    assert [m.embeds for m in messages] == [["a"], ["b"]]
@@ -0,0 +1,126 @@
+import time
+from datetime import datetime, timezone
+
+from utils.poll_scheduler import (
+    POLL_DEFAULT_INTERVAL,
+    POLL_JITTER,
+    POLL_MAX_INTERVAL,
+    POLL_MIN_INTERVAL,
+    PollScheduler,
+)
+
+NOW = 1_700_000_000.0
+
+
+def naive_utc(timestamp):
+    """Returns a Unix time as the naive UTC datetime stored in the `games` table."""
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(tzinfo=None)
+
+
+def news(*dates):
+    return [{"gid": str(i), "date": int(date)} for i, date in enumerate(dates)]
+
+
+def test_sync_spreads_new_apps_across_default_interval():
+    scheduler = PollScheduler()
+    appids = range(1, 101)
+    scheduler.sync(appids, now=NOW)
+
+    assert len(scheduler) == 100
+    due_times = sorted(scheduler._due_at.values())
+    assert NOW <= due_times[0] and due_times[-1] < NOW + POLL_DEFAULT_INTERVAL
+    # The first half of the interval holds roughly half of the apps.
+    first_half = sum(1 for t in due_times if t < NOW + POLL_DEFAULT_INTERVAL / 2)
+    assert 30 < first_half < 70
+    assert sorted(scheduler.pop_due(now=NOW + POLL_DEFAULT_INTERVAL)) == list(appids)
+
+
+def test_sync_drops_unsubscribed_apps():
+    scheduler = PollScheduler()
+    scheduler.sync([1, 2, 3], now=NOW)
+    scheduler.sync([2], now=NOW)
+    assert 2 in scheduler and 1 not in scheduler and 3 not in scheduler
+    assert scheduler.pop_due(now=NOW + POLL_DEFAULT_INTERVAL) == [2]
+
+
+def test_pop_due_orders_by_lateness_and_reports_backlog():
+    scheduler = PollScheduler()
+    for appid, due_at in [(1, NOW - 30), (2, NOW - 90), (3, NOW - 60), (4, NOW + 60)]:
+        scheduler._schedule(appid, due_at)
+
+    assert scheduler.pop_due(now=NOW, limit=2) == [2, 3]
+    assert scheduler.lag == 90
+    assert scheduler.backlog == 1
+
+    assert scheduler.pop_due(now=NOW) == [1]
+    assert scheduler.lag == 30
+    assert scheduler.backlog == 0
+    assert 4 in scheduler
+
+
+def test_reschedule_supersedes_earlier_entry():
+    scheduler = PollScheduler()
+    scheduler.sync([1], now=NOW)
+    scheduler.record_poll(1, [], now=NOW)
+    assert scheduler.pop_due(now=NOW + POLL_MAX_INTERVAL * 2) == [1]
+    assert scheduler.pop_due(now=NOW + POLL_MAX_INTERVAL * 2) == []
+
+
+def test_record_poll_without_history_uses_default():
+    scheduler = PollScheduler()
+    assert scheduler.record_poll(1, [], now=NOW) == POLL_DEFAULT_INTERVAL
+    due_at = scheduler._due_at[1]
+    spread = POLL_DEFAULT_INTERVAL * POLL_JITTER
+    assert NOW + POLL_DEFAULT_INTERVAL - spread <= due_at
+    assert due_at <= NOW + POLL_DEFAULT_INTERVAL + spread
+
+
+def test_active_game_is_polled_at_minimum_interval():
+    scheduler = PollScheduler()
+    interval = scheduler.record_poll(1, news(NOW - 1200, NOW - 600, NOW - 60), now=NOW)
+    assert interval == POLL_MIN_INTERVAL
+    assert scheduler.last_published[1] == NOW - 60
+
+
+def test_dormant_game_is_polled_at_maximum_interval():
+    scheduler = PollScheduler()
+    year = 365 * 24 * 60 * 60
+    interval = scheduler.record_poll(1, news(NOW - 2 * year, NOW - year), now=NOW)
+    assert interval == POLL_MAX_INTERVAL
+    assert scheduler.publish_intervals[1] == year
+
+
+def test_refetched_items_are_not_counted_twice():
+    scheduler = PollScheduler()
+    items = news(NOW - 20_000, NOW - 10_000)
+    scheduler.record_poll(1, items, now=NOW)
+    assert scheduler.publish_intervals[1] == 10_000
+
+    scheduler.record_poll(1, items, now=NOW + 600)
+    assert scheduler.publish_intervals[1] == 10_000
+
+    scheduler.record_poll(1, items + news(NOW + 10_000), now=NOW + 10_000)
+    assert scheduler.publish_intervals[1] == 0.3 * 20_000 + 0.7 * 10_000
+
+
+def test_seed_restores_schedule():
+    scheduler = PollScheduler()
+    checked_at = int(time.time()) - 60
+    scheduler.seed(1, naive_utc(checked_at), 100_000)
+    assert scheduler.publish_intervals[1] == 100_000
+    assert scheduler.intervals[1] == 100_000 // 20
+    assert scheduler._due_at[1] == checked_at + 100_000 // 20
+
+
+def test_seed_spreads_overdue_apps_into_their_slot():
+    scheduler = PollScheduler()
+    before = time.time()
+    scheduler.seed(1, naive_utc(before - 30 * 24 * 60 * 60), None)
+    assert before <= scheduler._due_at[1] <= before + POLL_DEFAULT_INTERVAL + 1
+
+
+def test_seed_without_last_check_waits_for_sync():
+    scheduler = PollScheduler()
+    scheduler.seed(1, None, None)
+    assert 1 not in scheduler
+    assert scheduler.intervals[1] == POLL_DEFAULT_INTERVAL
@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+from utils.rate_limiter import TokenBucket
+
+
+def test_bucket_starts_full():
+    async def main():
+        bucket = TokenBucket(rate=1, capacity=5)
+        assert bucket.available == 5
+        for _ in range(5):
+            await bucket.acquire()
+        assert bucket.available < 1
+
+    asyncio.run(main())
+
+
+def test_acquire_waits_for_refill():
+    async def main():
+        bucket = TokenBucket(rate=50, capacity=1)
+        started = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire()
+        return time.monotonic() - started
+
+    # Two refills at 50 tokens per second take about 40ms.
+    assert asyncio.run(main()) >= 0.035
+
+
+def test_refill_is_capped_at_capacity():
+    async def main():
+        bucket = TokenBucket(rate=1000, capacity=2)
+        await bucket.acquire(2)
+        await asyncio.sleep(0.02)
+        assert bucket.available == 2
+
+    asyncio.run(main())
+
+
+def test_waiters_are_served_in_arrival_order():
+    async def main():
+        bucket = TokenBucket(rate=100, capacity=1)
+        order = []
+
+        async def take(i):
+            await bucket.acquire()
+            order.append(i)
+
+        await asyncio.gather(*(take(i) for i in range(5)))
+        return order
+
+    assert asyncio.run(main()) == list(range(5))
@@ -0,0 +1,63 @@
+# utils/app_list.py
+import json
+from typing import Any, Dict, Iterator
+
+_READ_SIZE = 1 << 16
+
+
+def iter_app_list(path: str) -> Iterator[Dict[str, Any]]:
+    """
+    Streams the app entries of a Steam app list dump without loading it whole.
+
+    The file is expected in the JSON shape returned by ISteamApps/GetAppList,
+    `{"applist": {"apps": [{"appid": 10, "name": "Counter-Strike"}, ...]}}`.
+    Only a small window of the file is held in memory at a time.
+
+    Args:
+        path (str): The path of the JSON dump.
+
+    Yields:
+        Dict[str, Any]: Each app entry, in file order.
+    """
+    decoder = json.JSONDecoder()
+
+    with open(path, encoding="utf-8") as f:
+        # Skip ahead to the opening bracket of the "apps" array.
+        buffer = ""
+        while True:
+            chunk = f.read(_READ_SIZE)
+            if not chunk:
+                return
+            buffer += chunk
+            key = buffer.find('"apps"')
+            if key == -1:
+                buffer = buffer[-len('"apps"') :]
+                continue
+            bracket = buffer.find("[", key)
+            if bracket != -1:
+                buffer = buffer[bracket + 1 :]
+                break
+
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == "]":
+                return
+
+            try:
+                entry, pos = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                # The next entry is cut off at the end of the buffer.
+                chunk = f.read(_READ_SIZE)
+                if not chunk:
+                    raise
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+
+            yield entry
+
+            if pos > _READ_SIZE:
+                buffer = buffer[pos:]
+                pos = 0
@@ -1,19 +1,27 @@
 # utils/bot_database.py
+import asyncio
+import functools
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 from datetime import datetime
+from typing import Any, Callable, TypeVar
 
 from dotenv import load_dotenv
 from sqlalchemy import (
     BigInteger,
+    Boolean,
     Column,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
+    Text,
     UniqueConstraint,
     create_engine,
+    inspect,
 )
 from sqlalchemy.engine.url import URL
 from sqlalchemy.orm import declarative_base, relationship, sessionmaker
@@ -29,6 +37,8 @@ DB_PASSWORD = os.getenv("DATABASE_PASSWORD")
 DB_HOST = os.getenv("DATABASE_HOST")
 DB_PORT = os.getenv("DATABASE_PORT", "3306")
 DB_NAME = os.getenv("DATABASE_NAME")
+DB_POOL_SIZE = int(os.getenv("DATABASE_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DATABASE_MAX_OVERFLOW", "5"))
 
 if not all([DB_USER, DB_PASSWORD, DB_HOST, DB_NAME]):
     logger.error(
@@ -48,7 +58,13 @@ DATABASE_URL = URL.create(
     database=DB_NAME,
 )
 
-engine = create_engine(DATABASE_URL, echo=False, pool_pre_ping=True)
+engine = create_engine(
+    DATABASE_URL,
+    echo=False,
+    pool_pre_ping=True,
+    pool_size=DB_POOL_SIZE,
+    max_overflow=DB_MAX_OVERFLOW,
+)
 
 Base = declarative_base()
 
@@ -64,6 +80,11 @@ class Game(Base):
     last_checked = Column(
         DateTime, nullable=True, comment="Timestamp of last news check from Steam API"
     )
+    publish_interval = Column(
+        Integer,
+        nullable=True,
+        comment="Observed average seconds between news posts, used to schedule polls",
+    )
 
     subscriptions = relationship(
         "Subscription", back_populates="game", cascade="all, delete-orphan"
@@ -96,10 +117,39 @@ class DiscordServer(Base):
     timezone = Column(
         String(50), nullable=True, comment="Timezone for specific scheduling needs"
     )
+    digest_enabled = Column(
+        Boolean,
+        nullable=False,
+        default=False,
+        server_default="0",
+        comment="Whether news is collected and posted as a periodic digest",
+    )
+    digest_interval_minutes = Column(
+        Integer,
+        nullable=True,
+        comment="Length of the digest window in minutes; NULL uses the default",
+    )
+    webhook_delivery = Column(
+        Boolean,
+        nullable=False,
+        default=False,
+        server_default="0",
+        comment="Whether news is posted through a channel webhook",
+    )
+    active = Column(
+        Boolean,
+        nullable=False,
+        default=True,
+        server_default="1",
+        comment="Whether the bot is still a member of the guild",
+    )
 
     subscriptions = relationship(
         "Subscription", back_populates="server", cascade="all, delete-orphan"
     )
+    webhooks = relationship(
+        "ChannelWebhook", back_populates="server", cascade="all, delete-orphan"
+    )
 
     def __repr__(self):
         return (
@@ -143,6 +193,7 @@ class Subscription(Base):
 
     __table_args__ = (
         UniqueConstraint("server_id", "steam_id", name="_server_steam_uc"),
+        Index("ix_subscriptions_steam_id", "steam_id"),
     )
 
     server = relationship("DiscordServer", back_populates="subscriptions")
@@ -152,6 +203,125 @@ class Subscription(Base):
         return f"<Subscription(server_id={self.server_id}, steam_id={self.steam_id}, last_news_item_timestamp={self.last_news_item_timestamp})>"
 
 
+class NewsItem(Base):
+    """Represents a Steam news item archived after it was fetched."""
+
+    __tablename__ = "news_items"
+
+    gid = Column(BigInteger, primary_key=True, comment="Steam news item GID")
+    steam_id = Column(
+        BigInteger,
+        ForeignKey("games.steam_id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Steam Application ID",
+    )
+    title = Column(String(512), nullable=False, comment="News item title")
+    url = Column(String(1024), nullable=False, comment="Link to the full news post")
+    author = Column(String(255), nullable=True, comment="News item author")
+    date = Column(
+        BigInteger, nullable=False, comment="Unix timestamp the item was published"
+    )
+    contents = Column(
+        Text, nullable=True, comment="News body with BBCode and HTML stripped"
+    )
+    fetched_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        comment="Time the item was first fetched (UTC)",
+    )
+
+    __table_args__ = (Index("ix_news_items_steam_date", "steam_id", "date"),)
+
+    def __repr__(self):
+        return f"<NewsItem(gid={self.gid}, steam_id={self.steam_id}, title='{self.title}')>"
+
+
+class PendingDelivery(Base):
+    """Represents a news item queued for delivery to a Discord channel (the outbox)."""
+
+    __tablename__ = "delivery_outbox"
+
+    STATUS_PENDING = "pending"
+    STATUS_SENT = "sent"
+    STATUS_FAILED = "failed"
+
+    delivery_id = Column(
+        BigInteger,
+        primary_key=True,
+        autoincrement=True,
+        comment="Unique ID for this delivery",
+    )
+    server_id = Column(
+        BigInteger,
+        ForeignKey("discord_servers.server_id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Discord Guild ID",
+    )
+    steam_id = Column(BigInteger, nullable=False, comment="Steam Application ID")
+    channel_id = Column(
+        BigInteger, nullable=False, comment="Discord Channel ID to deliver to"
+    )
+    news_gid = Column(BigInteger, nullable=False, comment="GID of the news item")
+    payload = Column(Text, nullable=False, comment="JSON-encoded Steam news item")
+    status = Column(
+        String(10),
+        nullable=False,
+        default=STATUS_PENDING,
+        comment="One of 'pending', 'sent' or 'failed'",
+    )
+    attempts = Column(
+        Integer, nullable=False, default=0, comment="Number of failed send attempts"
+    )
+    next_attempt_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        comment="Earliest time (UTC) the next send may be attempted",
+    )
+    created_at = Column(
+        DateTime, nullable=False, default=datetime.utcnow, comment="Time queued (UTC)"
+    )
+    sent_at = Column(
+        DateTime, nullable=True, comment="Time the send was confirmed (UTC)"
+    )
+
+    __table_args__ = (
+        UniqueConstraint("server_id", "steam_id", "news_gid", name="_outbox_news_uc"),
+        Index("ix_delivery_outbox_due", "status", "next_attempt_at"),
+    )
+
+    def __repr__(self):
+        return f"<PendingDelivery(delivery_id={self.delivery_id}, server_id={self.server_id}, steam_id={self.steam_id}, news_gid={self.news_gid}, status='{self.status}')>"
+
+
+class ChannelWebhook(Base):
+    """Represents the webhook the bot created in a news channel."""
+
+    __tablename__ = "channel_webhooks"
+
+    channel_id = Column(BigInteger, primary_key=True, comment="Discord Channel ID")
+    server_id = Column(
+        BigInteger,
+        ForeignKey("discord_servers.server_id", ondelete="CASCADE"),
+        nullable=False,
+        comment="Discord Guild ID",
+    )
+    webhook_id = Column(BigInteger, nullable=False, comment="Discord Webhook ID")
+    webhook_token = Column(String(255), nullable=False, comment="Discord Webhook token")
+    created_at = Column(
+        DateTime,
+        nullable=False,
+        default=datetime.utcnow,
+        comment="Time the webhook was created (UTC)",
+    )
+
+    server = relationship("DiscordServer", back_populates="webhooks")
+
+    def __repr__(self):
+        return f"<ChannelWebhook(channel_id={self.channel_id}, server_id={self.server_id}, webhook_id={self.webhook_id})>"
+
+
 # --- Session Management ---
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -166,8 +336,81 @@ def get_db_session():
         session.close()
 
 
+# --- Async Access ---
+# Blocking database work runs on a dedicated thread pool sized to the connection
+# pool, so a slow MySQL round trip never stalls the discord.py event loop and
+# every worker thread can always check out a connection.
+_db_executor = ThreadPoolExecutor(
+    max_workers=DB_POOL_SIZE + DB_MAX_OVERFLOW, thread_name_prefix="hermes-db"
+)
+
+T = TypeVar("T")
+
+
+async def run_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Runs a blocking database function on the database thread pool.
+
+    Args:
+        func (Callable[..., T]): The synchronous function to run. It should open its own session with `get_db_session`.
+        *args: Positional arguments passed to `func`.
+        **kwargs: Keyword arguments passed to `func`.
+
+    Returns:
+        T: The value returned by `func`.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _db_executor, functools.partial(func, *args, **kwargs)
+    )
+
+
+def shutdown_db_executor() -> None:
+    """Waits for in-flight database work to finish and releases the thread pool."""
+    _db_executor.shutdown(wait=True)
+    engine.dispose()
+
+
 def create_tables():
     """Creates all defined tables in the database."""
     logger.info("Attempting to create database tables...")
     Base.metadata.create_all(engine)
+    add_missing_columns()
     logger.info("Database tables created or already exist.")
+
+
+def add_missing_columns():
+    """
+    Adds columns and indexes that were added to the models after their table was created.
+
+    `create_all` only creates missing tables, so this brings existing tables up
+    to date. New columns on existing tables must be nullable or declare a
+    `server_default`.
+    """
+    inspector = inspect(engine)
+
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+
+                column_type = column.type.compile(dialect=engine.dialect)
+                ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                if column.server_default is not None:
+                    ddl += f" NOT NULL DEFAULT {column.server_default.arg}"
+                else:
+                    ddl += " NULL"
+
+                logger.info(f"Adding column {table.name}.{column.name}.")
+                conn.exec_driver_sql(ddl)
+
+            existing_indexes = {i["name"] for i in inspector.get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in existing_indexes:
+                    logger.info(f"Adding index {index.name} on {table.name}.")
+                    index.create(conn)
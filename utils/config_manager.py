@@ -1,11 +1,74 @@
 # utils/config_manager.py
+import calendar
 import logging
-from typing import Optional
+import os
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
 
-from utils.bot_database import DiscordServer, get_db_session
+from sqlalchemy import update
+
+from utils.bot_database import DiscordServer, get_db_session, run_db
+from utils.sharding import ShardFilter
 
 logger = logging.getLogger(__name__)
 
+# --- Digest Configuration ---
+DIGEST_DEFAULT_INTERVAL_MINUTES = int(
+    os.getenv("DIGEST_DEFAULT_INTERVAL_MINUTES", "60")
+)
+DIGEST_MIN_INTERVAL_MINUTES = 5
+DIGEST_MAX_INTERVAL_MINUTES = 24 * 60
+
+
+def next_digest_at(
+    interval_minutes: Optional[int], now: Optional[datetime] = None
+) -> datetime:
+    """
+    Computes when a digest window closes.
+
+    Windows are aligned to the Unix epoch, so every item queued during a
+    window becomes due at the same instant and is sent in one digest.
+
+    Args:
+        interval_minutes (Optional[int]): The digest window in minutes, or None for the default.
+        now (Optional[datetime], optional): The current naive UTC time. Defaults to the time of the call.
+
+    Returns:
+        datetime: The end of the current window, as a naive UTC datetime.
+    """
+    now = now or datetime.utcnow()
+    window = (interval_minutes or DIGEST_DEFAULT_INTERVAL_MINUTES) * 60
+    closes_at = (calendar.timegm(now.utctimetuple()) // window + 1) * window
+    return datetime.utcfromtimestamp(closes_at)
+
+
+class GuildConfig(NamedTuple):
+    """The cached settings of a single guild."""
+
+    channel_id: int
+    prefix: Optional[str]
+    timezone: Optional[str]
+    digest_enabled: bool = False
+    digest_interval_minutes: Optional[int] = None
+    webhook_delivery: bool = False
+
+    @classmethod
+    def from_model(cls, guild_config: DiscordServer) -> "GuildConfig":
+        """Builds a cache entry from a `DiscordServer` row."""
+        return cls(
+            guild_config.channel_id,
+            guild_config.prefix,
+            guild_config.timezone,
+            bool(guild_config.digest_enabled),
+            guild_config.digest_interval_minutes,
+            bool(guild_config.webhook_delivery),
+        )
+
+    @property
+    def digest_interval(self) -> int:
+        """The guild's digest window in minutes, falling back to the default."""
+        return self.digest_interval_minutes or DIGEST_DEFAULT_INTERVAL_MINUTES
+
 
 class ConfigManager:
     def __init__(self):
@@ -15,9 +78,200 @@ class ConfigManager:
         This class provides a clean interface for interacting with the `discord_servers`
         table, handling creation, retrieval, and updates of server-level settings
         like the designated news channel.
+
+        Guild settings only change through this class, so they are kept in an
+        in-process cache. The cache is warmed in bulk with `warm_cache`, filled on
+        a miss, and updated write-through, so reads never touch the database.
+
+        Attributes:
+            _guild_configs (Dict[int, GuildConfig]): The cached settings, keyed by guild ID.
         """
+        self._guild_configs: Dict[int, GuildConfig] = {}
         logger.info("ConfigManager initialized for database operations.")
 
+    async def warm_cache(self) -> int:
+        """
+        Loads every guild's settings into the cache with a single query.
+
+        Returns:
+            int: The number of guild configurations loaded.
+        """
+        self._guild_configs = await run_db(self._load_guild_configs)
+        logger.info(f"Cached configuration for {len(self._guild_configs)} guilds.")
+        return len(self._guild_configs)
+
+    def _load_guild_configs(self) -> Dict[int, GuildConfig]:
+        """Blocking implementation of `warm_cache`, run on the database thread pool."""
+        with get_db_session() as session:
+            rows = session.query(
+                DiscordServer.server_id,
+                DiscordServer.channel_id,
+                DiscordServer.prefix,
+                DiscordServer.timezone,
+                DiscordServer.digest_enabled,
+                DiscordServer.digest_interval_minutes,
+                DiscordServer.webhook_delivery,
+            ).all()
+            return {
+                row.server_id: GuildConfig(
+                    row.channel_id,
+                    row.prefix,
+                    row.timezone,
+                    bool(row.digest_enabled),
+                    row.digest_interval_minutes,
+                    bool(row.webhook_delivery),
+                )
+                for row in rows
+            }
+
+    async def ensure_guild_configs(self, guilds: Iterable[Tuple[int, str]]) -> int:
+        """
+        Creates default configurations for every guild that does not have one yet.
+
+        Guilds already in the cache are skipped without a query, and the missing
+        ones are inserted together in one transaction.
+
+        Args:
+            guilds (Iterable[Tuple[int, str]]): The (guild ID, guild name) pairs to ensure.
+
+        Returns:
+            int: The number of configurations loaded or created.
+        """
+        missing = [
+            (guild_id, guild_name)
+            for guild_id, guild_name in guilds
+            if guild_id not in self._guild_configs
+        ]
+        if not missing:
+            return 0
+
+        created = await run_db(self._create_guild_configs, missing)
+        self._guild_configs.update(created)
+        return len(created)
+
+    def _create_guild_configs(
+        self, guilds: Iterable[Tuple[int, str]]
+    ) -> Dict[int, GuildConfig]:
+        """Blocking implementation of `ensure_guild_configs`, run on the database thread pool."""
+        guilds = dict(guilds)
+        with get_db_session() as session:
+            try:
+                configs = {
+                    guild_config.server_id: GuildConfig.from_model(guild_config)
+                    for guild_config in session.query(DiscordServer)
+                    .filter(DiscordServer.server_id.in_(guilds))
+                    .all()
+                }
+
+                missing_ids = [guild_id for guild_id in guilds if guild_id not in configs]
+                session.add_all(
+                    DiscordServer(
+                        server_id=guild_id,
+                        channel_id=guild_id,
+                        server_name=guilds[guild_id],
+                        prefix="!",
+                    )
+                    for guild_id in missing_ids
+                )
+                session.commit()
+
+                for guild_id in missing_ids:
+                    configs[guild_id] = GuildConfig(guild_id, "!", None)
+                    logger.info(
+                        f"Created default config for guild {guilds[guild_id]} ({guild_id})."
+                    )
+                return configs
+            except Exception as e:
+                session.rollback()
+                logger.error(
+                    f"Failed to create configs for {len(guilds)} guilds: {e}",
+                    exc_info=True,
+                )
+                return {}
+
+    async def set_guild_active(self, guild_id: int, active: bool) -> None:
+        """
+        Records whether the bot is still a member of a guild.
+
+        Guilds the bot has left keep their settings and subscriptions, in case
+        it is invited back, but are skipped when news is polled and queued.
+
+        Args:
+            guild_id (int): The unique ID of the Discord guild (server).
+            active (bool): Whether the bot is a member of the guild.
+        """
+        await run_db(self._set_guild_active, guild_id, active)
+
+    def _set_guild_active(self, guild_id: int, active: bool) -> None:
+        """Blocking implementation of `set_guild_active`, run on the database thread pool."""
+        with get_db_session() as session:
+            try:
+                session.execute(
+                    update(DiscordServer)
+                    .where(DiscordServer.server_id == guild_id)
+                    .values(active=active)
+                )
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                logger.error(
+                    f"Failed to set guild {guild_id} active to {active}: {e}",
+                    exc_info=True,
+                )
+
+    async def sync_active_guilds(
+        self, guild_ids: Iterable[int], shards: ShardFilter
+    ) -> None:
+        """
+        Marks exactly the given guilds as active among the guilds on some shards.
+
+        This catches up on guilds the bot joined or left while it was offline.
+
+        Args:
+            guild_ids (Iterable[int]): The guilds the bot is a member of.
+            shards (ShardFilter): The shards the given guilds were collected from. Guilds on other shards are left unchanged.
+        """
+        await run_db(self._sync_active_guilds, list(guild_ids), shards)
+
+    def _sync_active_guilds(self, guild_ids: List[int], shards: ShardFilter) -> None:
+        """Blocking implementation of `sync_active_guilds`, run on the database thread pool."""
+        with get_db_session() as session:
+            try:
+                session.execute(
+                    update(DiscordServer)
+                    .where(DiscordServer.server_id.in_(guild_ids))
+                    .values(active=True)
+                )
+                result = session.execute(
+                    update(DiscordServer)
+                    .where(
+                        shards.clause(DiscordServer.server_id),
+                        DiscordServer.server_id.notin_(guild_ids),
+                        DiscordServer.active.is_(True),
+                    )
+                    .values(active=False)
+                )
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Failed to sync active guilds: {e}", exc_info=True)
+                return
+
+        if result.rowcount:
+            logger.info(f"Marked {result.rowcount} guilds the bot left as inactive.")
+
+    def get_guild_config(self, guild_id: int) -> Optional[GuildConfig]:
+        """
+        Retrieves a guild's cached settings without touching the database.
+
+        Args:
+            guild_id (int): The unique ID of the Discord guild (server).
+
+        Returns:
+            Optional[GuildConfig]: The guild's settings, or None if they are not cached.
+        """
+        return self._guild_configs.get(guild_id)
+
     async def get_or_create_guild_config(
         self, guild_id: int, guild_name: str
     ) -> DiscordServer:
@@ -34,7 +288,16 @@ class ConfigManager:
         Returns:
             DiscordServer: The database model object for the guild's configuration.
         """
+        guild_config = await run_db(
+            self._get_or_create_guild_config, guild_id, guild_name
+        )
+        self._guild_configs[guild_id] = GuildConfig.from_model(guild_config)
+        return guild_config
 
+    def _get_or_create_guild_config(
+        self, guild_id: int, guild_name: str
+    ) -> DiscordServer:
+        """Blocking implementation of `get_or_create_guild_config`, run on the database thread pool."""
         with get_db_session() as session:
             guild_config = (
                 session.query(DiscordServer).filter_by(server_id=guild_id).first()
@@ -57,31 +320,54 @@ class ConfigManager:
         """
         Retrieves the configured news channel ID for a specific guild.
 
+        The value is served from the cache, and only loaded from the database
+        if the guild is not cached yet.
+
         Args:
             guild_id (str): The unique ID of the Discord guild (server).
 
         Returns:
             Optional[int]: The configured channel ID, or None if the configuration or channel ID does not exist.
         """
+        cached = self._guild_configs.get(guild_id)
+        if cached is not None:
+            return cached.channel_id
 
+        guild_config = await run_db(self._get_guild_config, guild_id)
+        if guild_config is None:
+            return None
+        self._guild_configs[guild_id] = guild_config
+        return guild_config.channel_id
+
+    def _get_guild_config(self, guild_id: int) -> Optional[GuildConfig]:
+        """Blocking implementation of `get_guild_channel_id`, run on the database thread pool."""
         with get_db_session() as session:
             guild_config = (
                 session.query(DiscordServer).filter_by(server_id=guild_id).first()
             )
             if guild_config:
-                return guild_config.channel_id
+                return GuildConfig.from_model(guild_config)
             return None
 
     async def set_guild_channel_id(self, guild_id: int, channel_id: int) -> None:
         """
         Sets the news channel ID for a specific guild.
 
-        If the guild's configuration does not exist, a new one is created.
+        If the guild's configuration does not exist, a new one is created. The
+        cache is updated once the change is committed.
 
         Args:
             guild_id (str): The unique ID of the Discord guild (server).
             channel_id (int): The channel ID to be set as the news channel.
         """
+        guild_config = await run_db(self._set_guild_channel_id, guild_id, channel_id)
+        if guild_config is not None:
+            self._guild_configs[guild_id] = guild_config
+
+    def _set_guild_channel_id(
+        self, guild_id: int, channel_id: int
+    ) -> Optional[GuildConfig]:
+        """Blocking implementation of `set_guild_channel_id`, run on the database thread pool."""
         with get_db_session() as session:
             guild_config = (
                 session.query(DiscordServer).filter_by(server_id=guild_id).first()
@@ -89,6 +375,7 @@ class ConfigManager:
             if guild_config:
                 guild_config.channel_id = channel_id
                 session.commit()
+                return GuildConfig.from_model(guild_config)
             else:
                 logger.warning(
                     f"Attempted to set channel_id for non-existent guild {guild_id}. Creating it."
@@ -103,3 +390,109 @@ class ConfigManager:
                 logger.info(
                     f"Created new guild config for {guild_id} with channel {channel_id} during set operation."
                 )
+                return GuildConfig.from_model(new_guild)
+
+    async def set_guild_digest(
+        self, guild_id: int, enabled: bool, interval_minutes: Optional[int] = None
+    ) -> Optional[GuildConfig]:
+        """
+        Turns a guild's digest mode on or off.
+
+        In digest mode, a guild's news is collected over a window and posted as
+        one combined message when the window closes. The cache is updated once
+        the change is committed.
+
+        Args:
+            guild_id (int): The unique ID of the Discord guild (server).
+            enabled (bool): Whether news should be posted as a digest.
+            interval_minutes (Optional[int], optional): The digest window in minutes. Defaults to keeping the current window.
+
+        Returns:
+            Optional[GuildConfig]: The guild's updated settings, or None if the guild has no configuration.
+        """
+        guild_config = await run_db(
+            self._set_guild_digest, guild_id, enabled, interval_minutes
+        )
+        if guild_config is not None:
+            self._guild_configs[guild_id] = guild_config
+        return guild_config
+
+    def _set_guild_digest(
+        self, guild_id: int, enabled: bool, interval_minutes: Optional[int]
+    ) -> Optional[GuildConfig]:
+        """Blocking implementation of `set_guild_digest`, run on the database thread pool."""
+        with get_db_session() as session:
+            try:
+                guild_config = (
+                    session.query(DiscordServer).filter_by(server_id=guild_id).first()
+                )
+                if not guild_config:
+                    logger.warning(
+                        f"Attempted to set digest mode for non-existent guild {guild_id}."
+                    )
+                    return None
+
+                guild_config.digest_enabled = enabled
+                if interval_minutes is not None:
+                    guild_config.digest_interval_minutes = interval_minutes
+                session.commit()
+                logger.info(
+                    f"Set digest mode for guild {guild_id} to {enabled} ({guild_config.digest_interval_minutes} minutes)."
+                )
+                return GuildConfig.from_model(guild_config)
+            except Exception as e:
+                session.rollback()
+                logger.error(
+                    f"Failed to set digest mode for guild {guild_id}: {e}",
+                    exc_info=True,
+                )
+                return None
+
+    async def set_guild_webhook_delivery(
+        self, guild_id: int, enabled: bool
+    ) -> Optional[GuildConfig]:
+        """
+        Turns webhook delivery on or off for a guild.
+
+        With webhook delivery, news is posted through a webhook the bot creates
+        in each news channel, which has its own rate limits. The cache is
+        updated once the change is committed.
+
+        Args:
+            guild_id (int): The unique ID of the Discord guild (server).
+            enabled (bool): Whether news should be posted through webhooks.
+
+        Returns:
+            Optional[GuildConfig]: The guild's updated settings, or None if the guild has no configuration.
+        """
+        guild_config = await run_db(self._set_guild_webhook_delivery, guild_id, enabled)
+        if guild_config is not None:
+            self._guild_configs[guild_id] = guild_config
+        return guild_config
+
+    def _set_guild_webhook_delivery(
+        self, guild_id: int, enabled: bool
+    ) -> Optional[GuildConfig]:
+        """Blocking implementation of `set_guild_webhook_delivery`, run on the database thread pool."""
+        with get_db_session() as session:
+            try:
+                guild_config = (
+                    session.query(DiscordServer).filter_by(server_id=guild_id).first()
+                )
+                if not guild_config:
+                    logger.warning(
+                        f"Attempted to set webhook delivery for non-existent guild {guild_id}."
+                    )
+                    return None
+
+                guild_config.webhook_delivery = enabled
+                session.commit()
+                logger.info(f"Set webhook delivery for guild {guild_id} to {enabled}.")
+                return GuildConfig.from_model(guild_config)
+            except Exception as e:
+                session.rollback()
+                logger.error(
+                    f"Failed to set webhook delivery for guild {guild_id}: {e}",
+                    exc_info=True,
+                )
+                return None
@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import os
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, NamedTuple, Optional
+
+from utils.rate_limiter import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+# --- Scheduler Configuration ---
+DELIVERY_WORKERS = int(os.getenv("DELIVERY_WORKERS", "16"))
+# Discord allows 50 requests per second per bot; stay slightly below it.
+DISCORD_GLOBAL_RATE = float(os.getenv("DISCORD_GLOBAL_RATE", "45"))
+
+SendFactory = Callable[[], Awaitable[bool]]
+
+
+class _QueuedSend(NamedTuple):
+    """A send waiting in its channel's queue."""
+
+    send: SendFactory
+    global_limited: bool
+    future: "asyncio.Future[bool]"
+
+
+class DeliveryScheduler:
+    def __init__(
+        self, workers: int = DELIVERY_WORKERS, global_rate: float = DISCORD_GLOBAL_RATE
+    ):
+        """
+        Initializes a concurrent, rate-limit-aware scheduler for Discord sends.
+
+        Sends are queued per channel and executed by a fixed pool of worker
+        tasks. Every send made with the bot's token takes a token from a bucket
+        shaped like Discord's global rate limit, while webhook posts, which
+        Discord limits per webhook, skip it. Sends to the same channel run one
+        at a time, in order, so that concurrent workers never compete for one
+        channel's per-route bucket. Sends to different channels run in parallel.
+
+        Workers take channels, not sends, off a ready queue. A channel is only
+        on that queue while it has sends waiting and none running, and is put
+        back at the end once its current send finishes. A channel with many
+        queued messages therefore occupies at most one worker, and takes turns
+        with the other channels instead of holding up every worker.
+
+        Attributes:
+            workers (int): The number of concurrent worker tasks.
+            sent (int): The number of sends that reported success.
+            failed (int): The number of sends that reported failure or raised.
+            max_queue_depth (int): The deepest the queue has been since startup.
+
+        Args:
+            workers (int, optional): The number of concurrent worker tasks. Defaults to DELIVERY_WORKERS.
+            global_rate (float, optional): The maximum sends per second across all channels. Defaults to DISCORD_GLOBAL_RATE.
+        """
+        self.workers = workers
+        self.global_bucket = TokenBucket(rate=global_rate, capacity=global_rate)
+
+        self.sent = 0
+        self.failed = 0
+        self.max_queue_depth = 0
+
+        self._ready: Optional[asyncio.Queue] = None
+        self._worker_tasks: list[asyncio.Task] = []
+        self._channel_queues: Dict[int, Deque[_QueuedSend]] = {}
+        self._queued = 0
+        self._in_flight = 0
+
+    def start(self) -> None:
+        """Starts the worker tasks. Must be called from the running event loop."""
+        if self._worker_tasks:
+            return
+        self._ready = asyncio.Queue()
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(), name=f"delivery-worker-{i}")
+            for i in range(self.workers)
+        ]
+        logger.info(f"DeliveryScheduler started with {self.workers} workers.")
+
+    async def stop(self) -> None:
+        """Cancels the worker tasks. Queued sends that have not started are dropped and resolve False."""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._ready = None
+        for queue in self._channel_queues.values():
+            for queued in queue:
+                if not queued.future.done():
+                    queued.future.set_result(False)
+        self._channel_queues.clear()
+        self._queued = 0
+
+    def submit(
+        self, channel_id: int, send: SendFactory, global_limited: bool = True
+    ) -> "asyncio.Future[bool]":
+        """
+        Queues a send to a channel.
+
+        Args:
+            channel_id (int): The channel the send targets, used to serialize sends per channel.
+            send (SendFactory): A callable returning a coroutine that performs the send and returns True on success.
+            global_limited (bool, optional): Whether the send counts against the bot's global rate limit. Webhook posts do not. Defaults to True.
+
+        Returns:
+            asyncio.Future[bool]: A future resolved with the send's result, or False if it raised.
+        """
+        if not self._worker_tasks:
+            self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        queue = self._channel_queues.get(channel_id)
+        if queue is None:
+            # The channel has nothing queued or running, so it becomes ready.
+            queue = self._channel_queues[channel_id] = deque()
+            self._ready.put_nowait(channel_id)
+        queue.append(_QueuedSend(send, global_limited, future))
+        self._queued += 1
+        self.max_queue_depth = max(self.max_queue_depth, self._queued)
+        return future
+
+    async def _worker(self) -> None:
+        """Takes ready channels off the queue and runs their next send under the rate limits."""
+        while True:
+            channel_id = await self._ready.get()
+            queue = self._channel_queues[channel_id]
+            send, global_limited, future = queue.popleft()
+            self._queued -= 1
+            try:
+                if global_limited:
+                    await self.global_bucket.acquire()
+                self._in_flight += 1
+                try:
+                    result = await send()
+                finally:
+                    self._in_flight -= 1
+                self._record(future, bool(result))
+            except asyncio.CancelledError:
+                self._record(future, False)
+                raise
+            except Exception as e:
+                logger.error(
+                    f"Unhandled exception in delivery to channel {channel_id}: {e}",
+                    exc_info=True,
+                )
+                self._record(future, False)
+            finally:
+                self._release_channel(channel_id, queue)
+                self._ready.task_done()
+
+    def _record(self, future: "asyncio.Future[bool]", result: bool) -> None:
+        """Resolves a send's future and updates the counters."""
+        if result:
+            self.sent += 1
+        else:
+            self.failed += 1
+        if not future.done():
+            future.set_result(result)
+
+    def _release_channel(self, channel_id: int, queue: Deque[_QueuedSend]) -> None:
+        """Puts a channel back on the ready queue if it has more sends, or forgets it."""
+        if self._channel_queues.get(channel_id) is not queue:
+            return
+        if queue:
+            self._ready.put_nowait(channel_id)
+        else:
+            del self._channel_queues[channel_id]
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Reports the scheduler's queue-depth and throughput metrics.
+
+        Returns:
+            Dict[str, int]: The current queue depth, sends in flight, channels with queued sends, the maximum queue depth seen, and the sent and failed totals.
+        """
+        return {
+            "queue_depth": self._queued,
+            "in_flight": self._in_flight,
+            "channels": len(self._channel_queues),
+            "max_queue_depth": self.max_queue_depth,
+            "sent": self.sent,
+            "failed": self.failed,
+        }
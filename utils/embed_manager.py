@@ -1,20 +1,84 @@
-# utils/embed_manager.py
+from collections import OrderedDict
+from typing import List, NamedTuple, Tuple
+
 import discord
 
 from utils.game_manager import GameManager
+from utils.news_formatting import clean_news_contents
+
+RENDER_CACHE_SIZE = 256
+# Discord's limit on an embed title.
+MAX_EMBED_TITLE_CHARS = 256
+# Digest pages stay a little under the 4096-character embed description limit.
+DIGEST_PAGE_CHARS = 4000
+DIGEST_TITLE_LENGTH = 120
+
+
+class RenderedNews(NamedTuple):
+    """A news item rendered once for delivery to any number of channels."""
+
+    message: str
+    embed: discord.Embed
+
+
+class DigestPage(NamedTuple):
+    """One page of a digest, sent as its own message."""
+
+    message: str
+    embed: discord.Embed
+    size: int  # The number of news items on the page.
 
 
 class EmbedManager:
     def __init__(self, game_manager: GameManager):
+        """
+        Initializes the EmbedManager for formatting news updates.
+
+        Rendered news items are kept in a small LRU cache keyed by news GID, so
+        a news item sent to many guilds is only formatted once.
+
+        Args:
+            game_manager (GameManager): The game manager used to resolve game names.
+        """
         self.game_manager = game_manager
+        self._render_cache: OrderedDict[int, RenderedNews] = OrderedDict()
+
+    def render_news(self, latest_news: dict, appid: int) -> RenderedNews:
+        """
+        Returns the message and embed for a news item, rendering it on first use.
+
+        The returned embed is shared by every caller and must not be modified.
+
+        Args:
+            latest_news (dict): A dictionary containing the news item details from the Steam API.
+            appid (int): The Steam Application ID for the game.
+
+        Returns:
+            RenderedNews: The text message and embed to send.
+        """
+        gid = int(latest_news["gid"])
+        rendered = self._render_cache.get(gid)
+        if rendered is not None:
+            self._render_cache.move_to_end(gid)
+            return rendered
+
+        rendered = RenderedNews(
+            self.get_news_message(latest_news, appid),
+            self.format_news_embed(latest_news, appid),
+        )
+        self._render_cache[gid] = rendered
+        if len(self._render_cache) > RENDER_CACHE_SIZE:
+            self._render_cache.popitem(last=False)
+        return rendered
 
     def format_news_embed(self, latest_news: dict, appid: int) -> discord.Embed:
         """
         Formats a Steam news item into a Discord embed.
 
         This method take a dictionary containing news details and an app ID,
-        then formats a rich Discord embed with the news title, a truncated
-        description, and a link to the full news post.
+        then formats a rich Discord embed with the news title, truncated to
+        Discord's limit, a cleaned and truncated description, and a link to the
+        full news post.
 
         Args:
             latest_news (dict): A dictionary containing the news item details from the Steam API.
@@ -25,9 +89,13 @@ class EmbedManager:
         """
         game_name = self.game_manager.get_name(appid)
 
+        title = latest_news["title"]
+        if len(title) > MAX_EMBED_TITLE_CHARS:
+            title = title[: MAX_EMBED_TITLE_CHARS - 1] + "…"
+
         embed = discord.Embed(
-            title=latest_news["title"],
-            description=latest_news["contents"][:300],
+            title=title,
+            description=clean_news_contents(latest_news["contents"]),
             url=latest_news["url"],
             color=discord.Color.blue(),
         )
@@ -50,4 +118,53 @@ class EmbedManager:
             str: A formatted string message ready to be sent to a Discord channel.
         """
         game_name = self.game_manager.get_name(appid)
-        return f"New update for {game_name} <t:{latest_news["date"]}:R>"
+        return f"New update for {game_name} <t:{latest_news['date']}:R>"
+
+    def format_digest_pages(
+        self, newsitems: List[Tuple[dict, int]]
+    ) -> List[DigestPage]:
+        """
+        Formats several news items into a combined digest, split into pages.
+
+        Each news item becomes one line linking to the post, and the lines are
+        packed into as few embeds as the description limit allows. Each page
+        is meant to be sent as its own message.
+
+        Args:
+            newsitems (List[Tuple[dict, int]]): The news items and their Steam App IDs, in the order they should be listed.
+
+        Returns:
+            List[DigestPage]: The text message, embed and item count of each page, in order.
+        """
+        lines = []
+        for latest_news, appid in newsitems:
+            title = latest_news["title"]
+            if len(title) > DIGEST_TITLE_LENGTH:
+                title = title[: DIGEST_TITLE_LENGTH - 1] + "…"
+            title = title.replace("[", "(").replace("]", ")")
+            lines.append(
+                f"**{self.game_manager.get_name(appid)}**: [{title}]({latest_news['url']}) <t:{latest_news['date']}:R>"
+            )
+
+        pages: List[List[str]] = [[]]
+        page_chars = 0
+        for line in lines:
+            if pages[-1] and page_chars + len(line) + 1 > DIGEST_PAGE_CHARS:
+                pages.append([])
+                page_chars = 0
+            pages[-1].append(line)
+            page_chars += len(line) + 1
+
+        rendered = []
+        for number, page in enumerate(pages, start=1):
+            embed = discord.Embed(
+                title="News digest",
+                description="\n".join(page),
+                color=discord.Color.blue(),
+            )
+            message = f"News digest: {len(lines)} new updates"
+            if len(pages) > 1:
+                embed.set_footer(text=f"Page {number}/{len(pages)}")
+                message += f" (page {number}/{len(pages)})"
+            rendered.append(DigestPage(message, embed, len(page)))
+        return rendered
@@ -0,0 +1,466 @@
+import bisect
+import difflib
+import heapq
+import re
+from array import array
+from collections import Counter
+from collections.abc import Mapping, Sequence
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+# The overlay of recent changes is folded into the compact arrays once it grows
+# past this many entries, or past a quarter of the catalogue, whichever is larger.
+COMPACT_MIN_OVERLAY = 1024
+
+# --- Search Configuration ---
+# How many names sharing the most trigrams with a query are ranked by similarity.
+FUZZY_CANDIDATES = 64
+# The minimum difflib similarity ratio for a fuzzy suggestion.
+FUZZY_CUTOFF = 0.5
+# The most postings counted per query; the rarest trigrams are counted first.
+FUZZY_POSTINGS_BUDGET = 20000
+
+_NON_WORD = re.compile(r"[\W_]+")
+
+
+class _CatalogueData(NamedTuple):
+    """The immutable, compact part of a catalogue, swapped in as a whole."""
+
+    appids: array  # sorted Steam App IDs ("q")
+    offsets: array  # start of each name in `blob`, plus a final end offset ("I")
+    blob: bytes  # every name, UTF-8 encoded, in appid order
+    name_order: array  # positions sorted by lowercase name ("I")
+
+
+_EMPTY = _CatalogueData(array("q"), array("I", [0]), b"", array("I"))
+
+
+class _SearchIndex(NamedTuple):
+    """A trigram inverted index over the names in one `_CatalogueData`."""
+
+    spans: Dict[str, int]  # trigram -> index of its first posting in `starts`
+    starts: array  # start of each trigram's postings, plus a final end ("I")
+    postings: array  # positions containing each trigram, grouped by trigram ("I")
+
+
+def _trigrams(lowered: str) -> set:
+    """Returns the set of word-padded trigrams of a lowercase name."""
+    padded = f" {_NON_WORD.sub(' ', lowered).strip()} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class SortedGames(Sequence):
+    def __init__(self, catalogue: "GameCatalogue", appids: array):
+        """
+        Initializes a read-only view of a catalogue's games in name order.
+
+        Only the app IDs are stored, so the view is cheap to keep; names are
+        looked up when an item or slice is accessed, and a page of a large
+        catalogue is built without touching the rest of it.
+
+        Args:
+            catalogue (GameCatalogue): The catalogue to resolve names from.
+            appids (array): The app IDs, sorted by lowercase name.
+        """
+        self._catalogue = catalogue
+        self._appids = appids
+
+    def __len__(self) -> int:
+        return len(self._appids)
+
+    def __getitem__(
+        self, index: Union[int, slice]
+    ) -> Union[Tuple[int, str], List[Tuple[int, str]]]:
+        if isinstance(index, slice):
+            return [(appid, self._name(appid)) for appid in self._appids[index]]
+        appid = self._appids[index]
+        return appid, self._name(appid)
+
+    def _name(self, appid: int) -> str:
+        """Returns a game's current name, tolerating a concurrent reload."""
+        return self._catalogue.get(appid, "Unknown Game")
+
+
+class GameCatalogue(Mapping):
+    def __init__(self, games: Iterable[Tuple[int, str]] = ()):
+        """
+        Initializes a compact, read-optimized map of Steam App IDs to game names.
+
+        Instead of two dicts of boxed ints and duplicated strings, the catalogue
+        keeps a sorted `array` of app IDs, every name in one UTF-8 blob indexed by
+        an offsets array, and a permutation of positions sorted by lowercase
+        name. Lookups by app ID and by name are binary searches. Games added
+        after construction go into a small dict overlay that is periodically
+        compacted into the arrays.
+
+        For misspelled names, `suggest` combines the sorted name order (prefix
+        matches) with a trigram inverted index over the compacted names (fuzzy
+        candidates), ranking the candidates with difflib. The index is only
+        ever built by `build_search_index` and `compact`, on the thread that
+        calls them, never by a lookup.
+
+        The catalogue is a read-only `Mapping[int, str]` from app ID to name.
+
+        Args:
+            games (Iterable[Tuple[int, str]], optional): The initial (app ID, name) pairs.
+        """
+        self._data = _EMPTY
+        self._overlay: Dict[int, str] = {}
+        self._overlay_names: Dict[str, int] = {}
+        self._search: Tuple[_CatalogueData, Optional[_SearchIndex]] = (_EMPTY, None)
+        self._version = 0
+        self._sorted: Tuple[int, Optional[SortedGames]] = (-1, None)
+        self._data = self._build(dict(games))
+
+    @staticmethod
+    def _build(games: Dict[int, str]) -> _CatalogueData:
+        """Builds the compact arrays from a complete app ID to name mapping."""
+        appids = array("q", sorted(games))
+        offsets = array("I", [0])
+        encoded = []
+        total = 0
+        for appid in appids:
+            name = games[appid].encode("utf-8")
+            encoded.append(name)
+            total += len(name)
+            offsets.append(total)
+
+        lowered = [games[appid].lower() for appid in appids]
+        name_order = array("I", sorted(range(len(appids)), key=lowered.__getitem__))
+        return _CatalogueData(appids, offsets, b"".join(encoded), name_order)
+
+    @staticmethod
+    def _name_at(data: _CatalogueData, position: int) -> str:
+        """Decodes the name stored at a position of the compact arrays."""
+        return data.blob[data.offsets[position] : data.offsets[position + 1]].decode(
+            "utf-8"
+        )
+
+    # --- Mapping interface ---
+
+    def __getitem__(self, appid: int) -> str:
+        name = self._overlay.get(appid)
+        if name is not None:
+            return name
+
+        data = self._data
+        position = bisect.bisect_left(data.appids, appid)
+        if position < len(data.appids) and data.appids[position] == appid:
+            return self._name_at(data, position)
+        raise KeyError(appid)
+
+    def __iter__(self) -> Iterator[int]:
+        data, overlay = self._data, dict(self._overlay)
+        for appid in data.appids:
+            if appid not in overlay:
+                yield appid
+        yield from overlay
+
+    def __len__(self) -> int:
+        data = self._data
+        overlay_only = sum(
+            1 for appid in list(self._overlay) if not self._in_base(data, appid)
+        )
+        return len(data.appids) + overlay_only
+
+    def __contains__(self, appid: object) -> bool:
+        return appid in self._overlay or (
+            isinstance(appid, int) and self._in_base(self._data, appid)
+        )
+
+    @staticmethod
+    def _in_base(data: _CatalogueData, appid: int) -> bool:
+        """Reports whether an app ID is stored in the compact arrays."""
+        position = bisect.bisect_left(data.appids, appid)
+        return position < len(data.appids) and data.appids[position] == appid
+
+    # --- Lookups and updates ---
+
+    def appid_for_name(self, game_name: str) -> Optional[int]:
+        """
+        Finds a game's app ID by its name, ignoring case.
+
+        Args:
+            game_name (str): The name of the game.
+
+        Returns:
+            Optional[int]: The game's Steam App ID, or None if no game has that name.
+        """
+        lowered = game_name.lower()
+
+        appid = self._overlay_names.get(lowered)
+        if appid is not None and self._overlay.get(appid, "").lower() == lowered:
+            return appid
+
+        data = self._data
+        position = bisect.bisect_left(
+            data.name_order,
+            lowered,
+            key=lambda index: self._name_at(data, index).lower(),
+        )
+        if position < len(data.name_order):
+            index = data.name_order[position]
+            if self._name_at(data, index).lower() == lowered:
+                appid = data.appids[index]
+                # A newer name in the overlay supersedes the compacted one.
+                renamed = self._overlay.get(appid)
+                if renamed is None or renamed.lower() == lowered:
+                    return appid
+        return None
+
+    def build_search_index(self) -> None:
+        """
+        Builds the trigram index used by `suggest` for the current arrays.
+
+        Once built, the index is kept up to date by every `compact`. This takes
+        a few seconds for a large catalogue, so call it off the event loop
+        after a load or import.
+        """
+        data = self._data
+        if self._search[0] is not data or self._search[1] is None:
+            self._search = (data, self._build_search_index(data))
+
+    def _build_search_index(self, data: _CatalogueData) -> _SearchIndex:
+        """Builds the trigram index over the names in `data`."""
+        groups: Dict[str, List[int]] = {}
+        for position in range(len(data.appids)):
+            for gram in _trigrams(self._name_at(data, position).lower()):
+                groups.setdefault(gram, []).append(position)
+
+        spans: Dict[str, int] = {}
+        starts = array("I", [0])
+        postings = array("I")
+        for gram, positions in groups.items():
+            spans[gram] = len(starts) - 1
+            postings.extend(positions)
+            starts.append(len(postings))
+
+        return _SearchIndex(spans, starts, postings)
+
+    def prefix_search(self, prefix: str, limit: int = 10) -> List[Tuple[int, str]]:
+        """
+        Finds games whose name starts with a prefix, ignoring case.
+
+        Args:
+            prefix (str): The start of the game's name.
+            limit (int, optional): The maximum number of games to return. Defaults to 10.
+
+        Returns:
+            List[Tuple[int, str]]: Up to `limit` (app ID, name) pairs, in name order.
+        """
+        lowered = prefix.lower()
+        data = self._data
+        matches: List[Tuple[str, int, str]] = []
+
+        position = bisect.bisect_left(
+            data.name_order,
+            lowered,
+            key=lambda index: self._name_at(data, index).lower(),
+        )
+        while position < len(data.name_order) and len(matches) < limit:
+            index = data.name_order[position]
+            name = self._name_at(data, index)
+            if not name.lower().startswith(lowered):
+                break
+            # Apps in the overlay are matched by their current name below.
+            if data.appids[index] not in self._overlay:
+                matches.append((name.lower(), data.appids[index], name))
+            position += 1
+
+        for appid, name in list(self._overlay.items()):
+            if name.lower().startswith(lowered):
+                matches.append((name.lower(), appid, name))
+
+        return [(appid, name) for _, appid, name in sorted(matches)[:limit]]
+
+    def suggest(self, query: str, limit: int = 5) -> List[Tuple[int, str]]:
+        """
+        Suggests the games whose names best match a possibly misspelled query.
+
+        An exact match comes first, then names starting with the query, then
+        fuzzy matches. Fuzzy candidates are the names sharing the most
+        trigrams with the query, found through the trigram index, plus the
+        overlay's names, and are ranked by difflib similarity. Names the index
+        holds that were renamed since it was built are skipped. Without an
+        index, only the overlay is searched for fuzzy matches.
+
+        Args:
+            query (str): The game name as the user typed it.
+            limit (int, optional): The maximum number of suggestions. Defaults to 5.
+
+        Returns:
+            List[Tuple[int, str]]: Up to `limit` (app ID, name) pairs, best match first.
+        """
+        lowered = query.lower().strip()
+        if not lowered:
+            return []
+
+        suggestions: Dict[int, str] = {}
+        exact = self.appid_for_name(lowered)
+        if exact is not None:
+            suggestions[exact] = self[exact]
+        for appid, name in self.prefix_search(lowered, limit):
+            suggestions.setdefault(appid, name)
+        if len(suggestions) >= limit:
+            return list(suggestions.items())[:limit]
+
+        grams = _trigrams(lowered)
+        candidates: Dict[str, Tuple[int, str]] = {}
+        indexed, index = self._search
+        if index is not None:
+            for position in self._fuzzy_positions(index, grams):
+                appid = indexed.appids[position]
+                name = self._name_at(indexed, position)
+                if self.get(appid) == name:
+                    candidates.setdefault(name.lower(), (appid, name))
+        for appid, name in list(self._overlay.items()):
+            if grams & _trigrams(name.lower()):
+                candidates.setdefault(name.lower(), (appid, name))
+
+        for match in difflib.get_close_matches(
+            lowered, candidates, n=limit, cutoff=FUZZY_CUTOFF
+        ):
+            appid, name = candidates[match]
+            suggestions.setdefault(appid, name)
+        return list(suggestions.items())[:limit]
+
+    @staticmethod
+    def _fuzzy_positions(index: _SearchIndex, grams: set) -> List[int]:
+        """Returns the indexed positions sharing the most trigrams with a query."""
+        spans = sorted(
+            (
+                (index.starts[span], index.starts[span + 1])
+                for span in map(index.spans.get, grams)
+                if span is not None
+            ),
+            key=lambda bounds: bounds[1] - bounds[0],
+        )
+        # Common trigrams barely narrow the candidates, so once the budget is
+        # spent on the rarer ones they are skipped.
+        shared: Counter = Counter()
+        counted = 0
+        for start, end in spans:
+            if counted and counted + end - start > FUZZY_POSTINGS_BUDGET:
+                break
+            shared.update(index.postings[start:end])
+            counted += end - start
+        return [position for position, _ in shared.most_common(FUZZY_CANDIDATES)]
+
+    def sorted_view(self) -> SortedGames:
+        """
+        Returns every game in case-insensitive name order.
+
+        The compacted names are already stored in this order, so the view only
+        has to merge in the overlay. It is cached until the catalogue changes.
+
+        Returns:
+            SortedGames: A sequence of (app ID, name) pairs, sorted by lowercase name.
+        """
+        version, view = self._sorted
+        if version == self._version and view is not None:
+            return view
+
+        version, data = self._version, self._data
+        overlay = sorted(
+            (name.lower(), appid) for appid, name in list(self._overlay.items())
+        )
+        base = (
+            (self._name_at(data, position).lower(), data.appids[position])
+            for position in data.name_order
+            if data.appids[position] not in self._overlay
+        )
+        if overlay:
+            ordered = (appid for _, appid in heapq.merge(base, overlay))
+        else:
+            ordered = (data.appids[position] for position in data.name_order)
+
+        view = SortedGames(self, array("q", ordered))
+        self._sorted = (version, view)
+        return view
+
+    def update_games(self, games: Iterable[Tuple[int, str]]) -> None:
+        """
+        Adds or renames games.
+
+        Changes are recorded in the overlay and compacted into the arrays once
+        the overlay grows large, so a long series of updates costs a logarithmic
+        number of rebuilds.
+
+        Args:
+            games (Iterable[Tuple[int, str]]): The (app ID, name) pairs to add or update.
+        """
+        for appid, name in games:
+            self._overlay[appid] = name
+            self._overlay_names[name.lower()] = appid
+        self._version += 1
+
+        if len(self._overlay) > max(COMPACT_MIN_OVERLAY, len(self._data.appids) // 4):
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Folds the overlay into the compact arrays.
+
+        If the catalogue has a search index, it is rebuilt for the new arrays
+        on the calling thread before they are swapped in, so `suggest` keeps
+        using the previous index until then.
+        """
+        if not self._overlay:
+            return
+        data = self._data
+        games = {
+            appid: self._name_at(data, position)
+            for position, appid in enumerate(data.appids)
+        }
+        games.update(self._overlay)
+        data = self._build(games)
+        if self._search[1] is not None:
+            self._search = (data, self._build_search_index(data))
+        self._data = data
+        self._overlay = {}
+        self._overlay_names = {}
+        self._version += 1
+
+
+def _measure(count: int = 150_000) -> None:
+    """Prints the resident size of the old two-dict layout and of a GameCatalogue."""
+    import gc
+    import random
+    import tracemalloc
+
+    words = ["Space", "Legends", "Quest", "Simulator", "of", "the", "Dark", "Tycoon"]
+    rng = random.Random(0)
+    source = [
+        (rng.randrange(10, 3_000_000), " ".join(rng.choices(words, k=3)) + f" {i}")
+        for i in range(count)
+    ]
+
+    def footprint(build):
+        gc.collect()
+        tracemalloc.start()
+        result = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return result, size
+
+    # Copy the pairs so neither layout shares string objects with `source`.
+    def build_dicts():
+        appid_to_name, name_to_appid = {}, {}
+        for appid, name in source:
+            name = (name + " ")[:-1]
+            appid_to_name[int(str(appid))] = name
+            name_to_appid[name.lower()] = int(str(appid))
+        return appid_to_name, name_to_appid
+
+    dicts, dict_size = footprint(build_dicts)
+    del dicts
+    catalogue, catalogue_size = footprint(lambda: GameCatalogue(source))
+
+    print(f"{len(catalogue)} games")
+    print(f"two dicts:   {dict_size / 2**20:6.1f} MiB")
+    print(f"catalogue:   {catalogue_size / 2**20:6.1f} MiB")
+    print(f"reduction:   {dict_size / catalogue_size:6.1f}x")
+
+
+if __name__ == "__main__":
+    _measure()
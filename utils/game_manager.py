@@ -1,51 +1,76 @@
 # utils/game_manager.py
 import logging
-from typing import Dict, Optional
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 
-from utils.bot_database import Game, get_db_session
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+from utils.app_list import iter_app_list
+from utils.bot_database import Game, Subscription, get_db_session, run_db
+from utils.game_catalogue import GameCatalogue, SortedGames
 
 logger = logging.getLogger(__name__)
 
+IMPORT_CHUNK_SIZE = 5000
+
 
 class GameManager:
-    def __init__(self):
+    def __init__(self, load_catalogue: bool = True):
         """
         Initializes the GameManager and loads game data from the database.
 
         The GameManager is responsible for providing fast, in-memory lookups
         of game information, such as converting a Steam App ID to a game name
-        and vice versa. The game data is loaded from the database into
-        two dictionaries upon intialization.
+        and vice versa, and suggesting games for misspelled names. The game data
+        is loaded from the database into a compact, searchable `GameCatalogue`
+        upon intialization.
+
+        Args:
+            load_catalogue (bool, optional): Whether to load the catalogue. Processes that only record polls, like the standalone poller, skip it. Defaults to True.
 
         Attributes:
-            appid_to_name (Dict[int, str]): A dictionary that maps a Steam App ID to its game name.
-            name_to_appid (Dict[str, int]): A dictionary that maps a game name to its Steam App ID.
+            catalogue (GameCatalogue): A read-only mapping of Steam App ID to game name, also searchable by name.
         """
-        self.appid_to_name: Dict[int, str] = {}
-        self.name_to_appid: Dict[str, int] = {}
+        self.catalogue = GameCatalogue()
 
-        self.load_games_from_db()
+        if load_catalogue:
+            self.load_games_from_db()
+
+    @property
+    def appid_to_name(self) -> GameCatalogue:
+        """The catalogue, as a read-only mapping of Steam App ID to game name."""
+        return self.catalogue
 
     def load_games_from_db(self) -> None:
         """
         Loads all game datga from the database into the GameManager's in-memory cache.
 
-        This method clears the existing in-memory dictionaries and repopulates them
-        by querying the `game` table in the database. This ensures the bot's cache
-        is up-to-date with the latest game information.
+        This method builds a fresh catalogue by querying the `game` table in the
+        database and then swaps it in, so lookups made while a reload is running
+        on another thread never observe a half-empty cache.
         """
-        self.appid_to_name.clear()
-        self.name_to_appid.clear()
-
         with get_db_session() as session:
             try:
-                games = session.query(Game).all()
-                for game in games:
-                    self.appid_to_name[game.steam_id] = game.game_name
-                    self.name_to_appid[game.game_name.lower()] = game.steam_id
-                logger.info(f"Loaded {len(games)} games from the database.")
+                catalogue = GameCatalogue(
+                    session.query(Game.steam_id, Game.game_name).yield_per(10000)
+                )
+                catalogue.build_search_index()
+                logger.info(f"Loaded {len(catalogue)} games from the database.")
             except Exception as e:
                 logger.error(f"Failed to load games from database: {e}", exc_info=True)
+                return
+
+        self.catalogue = catalogue
+
+    async def reload_games(self) -> None:
+        """
+        Reloads the in-memory game cache without blocking the event loop.
+
+        The database query runs on the database thread pool via `run_db`.
+        """
+        await run_db(self.load_games_from_db)
 
     def get_name(self, appid: int) -> str:
         """
@@ -60,7 +85,7 @@ class GameManager:
         Returns:
             str: The game's name or the string "Unknown Game" if the ID is not found.
         """
-        return self.appid_to_name.get(appid, "Unknown Game")
+        return self.catalogue.get(appid, "Unknown Game")
 
     def get_appid_by_name(self, game_name: str) -> Optional[int]:
         """
@@ -75,53 +100,184 @@ class GameManager:
         Returns:
             Optional[int]: The game's Steam App ID, or None if the name is not found.
         """
-        return self.name_to_appid.get(game_name.lower())
+        return self.catalogue.appid_for_name(game_name)
 
-    def add_game(self, steam_id: int, game_name: str) -> None:
+    def sorted_games(self) -> SortedGames:
         """
-        Adds a new game to the database or updates an existing one.
+        Gets every game in case-insensitive name order.
 
-        This method first checks if a game with the given Steam App ID already exists.
-        If it's a new game, it is added to the database. If it's an existing game,
-        its name is updated if it has changed. The in-memory cache is then updated
-        to reflect the change.
+        The view is cached by the catalogue until the game list changes, and
+        its pages are built lazily, so listing a page is cheap at any size.
+
+        Returns:
+            SortedGames: A sequence of (Steam App ID, game name) pairs, sorted by name.
+        """
+        return self.catalogue.sorted_view()
+
+    def suggest(self, query: str, limit: int = 5) -> List[Tuple[int, str]]:
+        """
+        Suggests games whose names are close to a possibly misspelled query.
+
+        Exact and prefix matches come first, followed by fuzzy matches found
+        through the catalogue's trigram index.
 
         Args:
-            steam_id (int): The Steam Application ID for the game.
-            game_name (str): The human-readable name of the game.
+            query (str): The game name as the user typed it.
+            limit (int, optional): The maximum number of suggestions. Defaults to 5.
+
+        Returns:
+            List[Tuple[int, str]]: Up to `limit` (Steam App ID, game name) pairs, best match first.
+        """
+        return self.catalogue.suggest(query, limit)
+
+    async def import_app_list(
+        self, path: str, chunk_size: int = IMPORT_CHUNK_SIZE
+    ) -> int:
+        """
+        Imports a Steam app list dump into the `games` table.
+
+        The dump is streamed with `iter_app_list` and written in chunks, each as
+        a single multi-row upsert (INSERT ... ON DUPLICATE KEY UPDATE) in its own
+        transaction. The in-memory maps are updated after every chunk, so the
+        new games become searchable while the import is still running, and the
+        catalogue is compacted once at the end. The work runs on the database
+        thread pool.
+
+        Args:
+            path (str): The path of the JSON dump, in the ISteamApps/GetAppList shape.
+            chunk_size (int, optional): The number of apps written per statement. Defaults to IMPORT_CHUNK_SIZE.
+
+        Returns:
+            int: The number of apps imported.
+        """
+        return await run_db(self._import_app_list, path, chunk_size)
+
+    def _import_app_list(self, path: str, chunk_size: int) -> int:
+        """Blocking implementation of `import_app_list`, run on the database thread pool."""
+        started = time.monotonic()
+        imported = 0
+        chunk: Dict[int, str] = {}
+
+        for entry in iter_app_list(path):
+            name = str(entry.get("name") or "").strip()
+            if not name or "appid" not in entry:
+                continue
+            chunk[int(entry["appid"])] = name[:255]
+
+            if len(chunk) >= chunk_size:
+                imported += self._upsert_games(chunk)
+                chunk = {}
+
+        if chunk:
+            imported += self._upsert_games(chunk)
+        self.catalogue.compact()
+        self.catalogue.build_search_index()
+
+        logger.info(
+            f"Imported {imported} games from {path} in {time.monotonic() - started:.1f}s."
+        )
+        return imported
+
+    def _upsert_games(self, games: Dict[int, str]) -> int:
+        """
+        Writes one chunk of games with a multi-row upsert and updates the in-memory maps.
+
+        Args:
+            games (Dict[int, str]): A mapping of Steam App ID to game name.
+
+        Returns:
+            int: The number of games written.
         """
+        stmt = mysql_insert(Game.__table__)
+        stmt = stmt.on_duplicate_key_update(game_name=stmt.inserted.game_name)
+        rows: List[Dict[str, Any]] = [
+            {"steam_id": steam_id, "game_name": game_name}
+            for steam_id, game_name in games.items()
+        ]
+
         with get_db_session() as session:
             try:
-                # Check if game already exists
-                existing_game = session.query(Game).filter_by(steam_id=steam_id).first()
-                needs_commit = False
-
-                if existing_game:
-                    # Update name if different, or just log
-                    if existing_game.game_name != game_name:
-                        existing_game.game_name = game_name
-                        logger.info(f"Updated game name for {steam_id} to {game_name}")
-                        needs_commit = True
-                    else:
-                        logger.info(
-                            f"Game {game_name} (ID: {steam_id}) already exists."
-                        )
-                else:
-                    new_game = Game(steam_id=steam_id, game_name=game_name)
-                    session.add(new_game)
-                    logger.info(
-                        f"Added new game to database: {game_name} (ID: {steam_id})"
-                    )
-                    needs_commit = True
-
-                if needs_commit:
-                    session.commit()
-                    self.appid_to_name[steam_id] = game_name
-                    self.name_to_appid[game_name.lower()] = steam_id
+                session.execute(stmt, rows)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+
+        self.catalogue.update_games(games.items())
+        return len(rows)
+
+    async def get_poll_states(
+        self,
+    ) -> Dict[int, Tuple[Optional[datetime], Optional[int]]]:
+        """
+        Retrieves the recorded polling state of every subscribed game.
+
+        Games that were never polled, which is most of an imported app list,
+        have no state and are skipped.
 
+        Returns:
+            Dict[int, Tuple[Optional[datetime], Optional[int]]]: A mapping of Steam App ID to its last checked time (UTC) and average seconds between news posts.
+        """
+        return await run_db(self._get_poll_states)
+
+    def _get_poll_states(self) -> Dict[int, Tuple[Optional[datetime], Optional[int]]]:
+        """Blocking implementation of `get_poll_states`, run on the database thread pool."""
+        with get_db_session() as session:
+            rows = (
+                session.query(Game.steam_id, Game.last_checked, Game.publish_interval)
+                .filter(
+                    Game.last_checked.isnot(None),
+                    Game.steam_id.in_(select(Subscription.steam_id).distinct()),
+                )
+                .all()
+            )
+            return {
+                steam_id: (last_checked, publish_interval)
+                for steam_id, last_checked, publish_interval in rows
+            }
+
+    async def record_polls(
+        self, polls: Dict[int, Tuple[datetime, Optional[int]]]
+    ) -> None:
+        """
+        Records when games were last polled and their observed publish frequency.
+
+        All games are updated with a single executemany UPDATE.
+
+        Args:
+            polls (Dict[int, Tuple[datetime, Optional[int]]]): A mapping of Steam App ID to its poll time (UTC) and average seconds between news posts, if known.
+        """
+        if polls:
+            await run_db(self._record_polls, polls)
+
+    def _record_polls(self, polls: Dict[int, Tuple[datetime, Optional[int]]]) -> None:
+        """Blocking implementation of `record_polls`, run on the database thread pool."""
+        table = Game.__table__
+        stmt = (
+            update(table)
+            .where(table.c.steam_id == bindparam("b_steam_id"))
+            .values(
+                last_checked=bindparam("b_last_checked"),
+                publish_interval=func.coalesce(
+                    bindparam("b_publish_interval"), table.c.publish_interval
+                ),
+            )
+        )
+        params = [
+            {
+                "b_steam_id": steam_id,
+                "b_last_checked": last_checked,
+                "b_publish_interval": publish_interval,
+            }
+            for steam_id, (last_checked, publish_interval) in polls.items()
+        ]
+
+        with get_db_session() as session:
+            try:
+                session.execute(stmt, params)
+                session.commit()
             except Exception as e:
                 session.rollback()
                 logger.error(
-                    f"Failed to add or update game {game_name} (ID: {steam_id}): {e}",
-                    exc_info=True,
+                    f"Failed to record polls for {len(polls)} games: {e}", exc_info=True
                 )
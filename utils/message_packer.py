@@ -0,0 +1,103 @@
+# utils/message_packer.py
+from typing import TYPE_CHECKING, Any, Callable, List, NamedTuple, Sequence, Tuple
+
+if TYPE_CHECKING:
+    import discord
+
+    from utils.embed_manager import DigestPage, RenderedNews
+    from utils.outbox_manager import OutboxDelivery
+
+# Discord's limits on a single message.
+MAX_MESSAGE_CHARS = 2000
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+
+
+class OutgoingMessage(NamedTuple):
+    """A Discord message carrying one or more queued deliveries to one channel."""
+
+    deliveries: List["OutboxDelivery"]
+    content: str
+    embeds: List["discord.Embed"]
+
+
+def pack_messages(
+    deliveries: Sequence["OutboxDelivery"],
+    render: Callable[[dict, int], "RenderedNews"],
+) -> List[OutgoingMessage]:
+    """
+    Splits the deliveries headed to one channel into messages.
+
+    Deliveries keep their order, and each message stays within Discord's
+    limits on embeds per message, total embed characters and content length.
+
+    Args:
+        deliveries (Sequence[OutboxDelivery]): The deliveries to one channel, oldest first.
+        render (Callable[[dict, int], RenderedNews]): Renders a news item and its app ID, like `EmbedManager.render_news`.
+
+    Returns:
+        List[OutgoingMessage]: The messages to send, in order.
+    """
+    messages = []
+    current: List[Tuple[Any, "RenderedNews"]] = []
+    embed_chars, content_chars = 0, 0
+    for delivery in deliveries:
+        rendered = render(delivery.news_item, delivery.appid)
+        size = len(rendered.embed)
+        line = len(rendered.message) + 1
+        if current and (
+            len(current) >= MAX_EMBEDS_PER_MESSAGE
+            or embed_chars + size > MAX_EMBED_CHARS_PER_MESSAGE
+            or content_chars + line > MAX_MESSAGE_CHARS
+        ):
+            messages.append(current)
+            current, embed_chars, content_chars = [], 0, 0
+        current.append((delivery, rendered))
+        embed_chars += size
+        content_chars += line
+    if current:
+        messages.append(current)
+
+    return [
+        OutgoingMessage(
+            [delivery for delivery, _ in message],
+            "\n".join(rendered.message for _, rendered in message),
+            [rendered.embed for _, rendered in message],
+        )
+        for message in messages
+    ]
+
+
+def pack_digest(
+    deliveries: Sequence["OutboxDelivery"],
+    format_pages: Callable[[List[Tuple[dict, int]]], List["DigestPage"]],
+) -> List[OutgoingMessage]:
+    """
+    Combines the deliveries headed to one channel into a digest.
+
+    The digest lists every news item on one line, so a busy window costs
+    one message per page instead of one per item.
+
+    Args:
+        deliveries (Sequence[OutboxDelivery]): The deliveries to one channel, oldest first.
+        format_pages (Callable[[List[Tuple[dict, int]]], List[DigestPage]]): Formats the news items and their app IDs into pages, like `EmbedManager.format_digest_pages`.
+
+    Returns:
+        List[OutgoingMessage]: One message per digest page, in order.
+    """
+    if not deliveries:
+        return []
+
+    pages = format_pages(
+        [(delivery.news_item, delivery.appid) for delivery in deliveries]
+    )
+    messages = []
+    start = 0
+    for page in pages:
+        messages.append(
+            OutgoingMessage(
+                list(deliveries[start : start + page.size]), page.message, [page.embed]
+            )
+        )
+        start += page.size
+    return messages
@@ -0,0 +1,52 @@
+import html
+import re
+
+NEWS_DESCRIPTION_LENGTH = 300
+
+# Steam news bodies mix BBCode, HTML and clan image placeholders.
+_DROPPED_BLOCKS = re.compile(
+    r"\[(img|previewyoutube|video)[^\]]*\].*?\[/\1\]", re.IGNORECASE | re.DOTALL
+)
+_LIST_ITEM = re.compile(r"\[\*\]")
+_LINE_BREAK = re.compile(r"\[/p\]|\[br\]|\[/h\d\]|<br\s*/?>|</p>", re.IGNORECASE)
+_BBCODE_URL = re.compile(r"\[url=[^\]]*\](.*?)\[/url\]", re.IGNORECASE | re.DOTALL)
+_BBCODE_TAG = re.compile(r"\[/?[a-z0-9*]+(=[^\]]*)?\]", re.IGNORECASE)
+_HTML_TAG = re.compile(r"<[^>]+>")
+_CLAN_IMAGE = re.compile(r"\{STEAM_CLAN_IMAGE\}\S*")
+_SPACES = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+def clean_news_contents(contents: str, max_length: int = NEWS_DESCRIPTION_LENGTH) -> str:
+    """
+    Converts a Steam news body into plain text suitable for an embed description.
+
+    BBCode and HTML markup, images and videos are removed, whitespace is
+    collapsed, and the text is truncated at a word boundary.
+
+    Args:
+        contents (str): The raw `contents` field of a Steam news item.
+        max_length (int, optional): The maximum length of the result. Defaults to NEWS_DESCRIPTION_LENGTH.
+
+    Returns:
+        str: The cleaned, truncated text.
+    """
+    text = _DROPPED_BLOCKS.sub("", contents)
+    text = _LIST_ITEM.sub("\n• ", text)
+    text = _LINE_BREAK.sub("\n", text)
+    text = _BBCODE_URL.sub(r"\1", text)
+    text = _BBCODE_TAG.sub("", text)
+    text = _HTML_TAG.sub(" ", text)
+    text = _CLAN_IMAGE.sub("", text)
+    text = html.unescape(text)
+    text = _SPACES.sub(" ", text)
+    text = _BLANK_LINES.sub("\n\n", text)
+    text = "\n".join(line.strip() for line in text.split("\n")).strip()
+
+    if len(text) <= max_length:
+        return text
+
+    truncated = text[: max_length - 1]
+    if " " in truncated:
+        truncated = truncated.rsplit(" ", 1)[0]
+    return truncated.rstrip(" .,;:") + "…"
@@ -1,100 +1,385 @@
 # utils/news_manager.py
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
 
-from utils.bot_database import Subscription, get_db_session
-from utils.steam_api import fetch_steam_news
+from sqlalchemy import bindparam, func, insert, update
+
+from utils.bot_database import NewsItem, Subscription, get_db_session, run_db
+from utils.news_formatting import clean_news_contents
+from utils.steam_api import steam_client
 
 logger = logging.getLogger(__name__)
 
+# --- Catch-up Window Configuration ---
+NEWS_WINDOW_MIN = int(os.getenv("NEWS_WINDOW_MIN", "3"))
+NEWS_WINDOW_MAX = int(os.getenv("NEWS_WINDOW_MAX", "20"))
+# Raw news bodies are cleaned of markup before display, so fetch more than the
+# 300 characters that are shown.
+NEWS_FETCH_MAXLENGTH = 1000
+
+# --- Archive Cache Configuration ---
+ARCHIVE_CACHE_APPS = int(os.getenv("ARCHIVE_CACHE_APPS", "2000"))
+ARCHIVE_CACHE_ITEMS = 10
+# Other processes (other shards, or a standalone poller) archive news too, so a
+# cached app is reloaded from the archive once its entry is this old.
+ARCHIVE_CACHE_TTL_SECONDS = int(os.getenv("ARCHIVE_CACHE_TTL_SECONDS", "60"))
+
 
 class NewsManager:
-    def __init__(self):
+    def __init__(self, cache_archive: bool = True):
         """
         Initializes the NewsManager for handling Steam news updates.
 
         This class provides methods for fetching news from the Steam API and
         for tracking which news items have been sent to subscribed guilds,
         using the database for persistence.
+
+        Updates to the last sent news GID are buffered with
+        `queue_last_news_id` and written back together by
+        `flush_last_news_ids`, so a large fan-out costs a single commit.
+
+        Every fetched news item is kept in the `news_items` archive, and the
+        newest items of recently used games are also held in memory, so later
+        lookups such as `!latest` never need to call Steam.
+
+        Args:
+            cache_archive (bool, optional): Whether to hold archived news in memory. Processes that never read the archive, like the standalone poller, turn it off. Defaults to True.
+
+        Attributes:
+            _pending_gids (Dict[Tuple[int, int], int]): Buffered GIDs keyed by (guild ID, app ID), waiting to be flushed.
+            _news_windows (Dict[int, int]): The number of recent news items to request per app ID, adapted to how often the game publishes.
+            _archive_cache (OrderedDict[int, Tuple[float, List[Dict[str, Any]]]]): When each app's entry was last known to be current, as a monotonic time, and its newest archived items, newest first, in least-recently-used order.
         """
+        self._pending_gids: Dict[Tuple[int, int], int] = {}
+        self._news_windows: Dict[int, int] = {}
+        self._archive_cache: OrderedDict[int, Tuple[float, List[Dict[str, Any]]]] = (
+            OrderedDict()
+        )
+        self._cache_archive = cache_archive
         logger.info("NewsManager initialized for database operations.")
 
-    async def get_last_news_id(self, guild_id: int, appid: int) -> Optional[int]:
+    def queue_last_news_id(self, guild_id: int, appid: int, news_gid: str) -> None:
         """
-        Retrieves the last recorded news GID for a specific game and guild.
+        Buffers the GID of the last news item sent for a subscription.
 
-        This method queries the `subscriptions` table to find the unique ID of the
-        last news item that was successfully sent for a given game and guild.
+        The update is held in memory until the next `flush_last_news_ids`. If
+        several GIDs are queued for the same subscription, only the newest is kept.
 
         Args:
             guild_id (int): The unique ID of the Discord guild (server).
             appid (int): The Steam Application ID for the game.
+            news_gid (str): The Global ID (GID) of the news item to save.
+        """
+        key = (guild_id, appid)
+        gid = int(news_gid)
+        if gid > self._pending_gids.get(key, 0):
+            self._pending_gids[key] = gid
+
+    async def flush_last_news_ids(self) -> int:
+        """
+        Writes every buffered news GID back to the database in one transaction.
+
+        The updates are sent as a single executemany UPDATE. A stored GID is never
+        moved backwards. If the write fails, the updates are put back in the
+        buffer so the next flush retries them.
 
         Returns:
-            Optional[int]: The Global ID (GID) of the last news item, or None if the subscription does not exist or has no GID saved.
+            int: The number of subscriptions written.
         """
+        if not self._pending_gids:
+            return 0
 
-        with get_db_session() as session:
-            subscription = (
-                session.query(Subscription)
-                .filter_by(server_id=guild_id, steam_id=appid)
-                .first()
+        pending, self._pending_gids = self._pending_gids, {}
+        try:
+            await run_db(self._flush_last_news_ids, pending)
+        except Exception as e:
+            logger.error(
+                f"Failed to flush {len(pending)} last news GIDs: {e}", exc_info=True
+            )
+            for (guild_id, appid), gid in pending.items():
+                self.queue_last_news_id(guild_id, appid, str(gid))
+            return 0
+
+        logger.info(f"Flushed last news GIDs for {len(pending)} subscriptions.")
+        return len(pending)
+
+    def _flush_last_news_ids(self, pending: Dict[Tuple[int, int], int]) -> None:
+        """Blocking implementation of `flush_last_news_ids`, run on the database thread pool."""
+        table = Subscription.__table__
+        stmt = (
+            update(table)
+            .where(table.c.server_id == bindparam("b_server_id"))
+            .where(table.c.steam_id == bindparam("b_steam_id"))
+            .values(
+                last_news_item_timestamp=func.greatest(
+                    func.coalesce(table.c.last_news_item_timestamp, 0),
+                    bindparam("b_gid"),
+                )
             )
+        )
+        params = [
+            {"b_server_id": guild_id, "b_steam_id": appid, "b_gid": gid}
+            for (guild_id, appid), gid in pending.items()
+        ]
 
-            if subscription:
-                return subscription.last_news_item_timestamp
-            return None
+        with get_db_session() as session:
+            try:
+                session.execute(stmt, params)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
 
-    async def save_last_news_id(self, guild_id: int, appid: int, news_gid: str) -> None:
+    async def fetch_new_news(
+        self, oldest_gids: Dict[int, Optional[int]]
+    ) -> Dict[int, List[Dict[str, Any]]]:
         """
-        Saves (updates) the GID of the last news item sent for a subscription.
+        Fetches every recent news item that at least one subscriber has not seen.
 
-        This method finds the subscription for a given guild and app ID and updates
-        the `last_news_item_timestamp` in the database.
+        Each app is fetched with its own window of recent items. If every item in
+        the window is newer than the app's oldest subscriber GID, the window may
+        have cut off unseen items, so it is doubled and refetched (up to
+        `NEWS_WINDOW_MAX`). The next cycle's window is then sized from the number
+        of new items observed, so bursty publishers are fully covered while
+        quiet games are fetched with `NEWS_WINDOW_MIN` items.
+
+        Args:
+            oldest_gids (Dict[int, Optional[int]]): A mapping of app ID to the oldest last sent GID among its subscribers, or None if no subscriber has received news yet.
+
+        Returns:
+            Dict[int, List[Dict[str, Any]]]: A mapping of app ID to its fetched news items, oldest first. Apps whose request failed map to an empty list.
+        """
+        appids = list(oldest_gids)
+        results = await asyncio.gather(
+            *(self._fetch_news_window(appid, oldest_gids[appid]) for appid in appids)
+        )
+        return dict(zip(appids, results))
+
+    async def _fetch_news_window(
+        self, appid: int, oldest_gid: Optional[int]
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetches one app's news, widening the window until it reaches `oldest_gid`.
 
         Args:
-            guild_id (int): The unique ID of the Discord guild (server).
             appid (int): The Steam Application ID for the game.
-            news_gid (str): The Global ID (GID) of the news item to save.
+            oldest_gid (Optional[int]): The oldest last sent GID among the app's subscribers.
+
+        Returns:
+            List[Dict[str, Any]]: The fetched news items, oldest first.
         """
+        window = self._news_windows.get(appid, NEWS_WINDOW_MIN)
 
-        with get_db_session() as session:
-            try:
-                subscription = (
-                    session.query(Subscription)
-                    .filter_by(server_id=guild_id, steam_id=appid)
-                    .first()
+        while True:
+            newsitems = await steam_client.fetch_news(
+                appid, count=window, maxlength=NEWS_FETCH_MAXLENGTH
+            )
+            if oldest_gid is None:
+                new_count = min(len(newsitems), 1)
+                break
+
+            new_count = sum(1 for item in newsitems if int(item["gid"]) > oldest_gid)
+            if new_count < len(newsitems) or len(newsitems) < window:
+                break
+            if window >= NEWS_WINDOW_MAX:
+                logger.warning(
+                    f"Appid {appid} published more than {window} news items since the last cycle. Older items will be skipped."
                 )
+                break
+
+            window = min(window * 2, NEWS_WINDOW_MAX)
+            logger.debug(f"Widening news window for appid {appid} to {window}.")
 
-                if subscription:
-                    subscription.last_news_item_timestamp = int(news_gid)
-                    session.commit()
-                    logger.info(
-                        f"Saved last news GID {news_gid} for guild {guild_id}, appid {appid}."
-                    )
+        self._news_windows[appid] = max(
+            NEWS_WINDOW_MIN, min(new_count * 2, NEWS_WINDOW_MAX)
+        )
 
-                else:
-                    logger.warning(
-                        f"Attempted to save last news GID for non-existent subscription (guild: {guild_id}, appid: {appid})."
-                    )
+        return sorted(newsitems, key=lambda item: (item["date"], int(item["gid"])))
+
+    async def archive_news(
+        self, news_by_appid: Dict[int, List[Dict[str, Any]]]
+    ) -> None:
+        """
+        Stores fetched news items in the `news_items` archive and the hot cache.
+
+        Items that are already archived are left unchanged. All new items are
+        written with a single multi-row insert.
+
+        Args:
+            news_by_appid (Dict[int, List[Dict[str, Any]]]): The news items fetched from the Steam API, per app ID.
+        """
+        archived_by_appid = {
+            appid: [self._to_archived_item(appid, item) for item in newsitems]
+            for appid, newsitems in news_by_appid.items()
+            if newsitems
+        }
+        if not archived_by_appid:
+            return
 
+        await run_db(
+            self._archive_news,
+            [item for items in archived_by_appid.values() for item in items],
+        )
+
+        if self._cache_archive:
+            # A fetch returns the app's newest items, so the entry is current.
+            checked_at = time.monotonic()
+            for appid, items in archived_by_appid.items():
+                self._cache_archived_news(appid, items, checked_at=checked_at)
+
+    def _archive_news(self, items: List[Dict[str, Any]]) -> None:
+        """Blocking implementation of `archive_news`, run on the database thread pool."""
+        rows = [
+            {
+                "gid": int(item["gid"]),
+                "steam_id": item["appid"],
+                "title": item["title"][:512],
+                "url": item["url"][:1024],
+                "author": (item["author"] or "")[:255] or None,
+                "date": int(item["date"]),
+                "contents": item["contents"],
+            }
+            for item in items
+        ]
+
+        with get_db_session() as session:
+            try:
+                session.execute(insert(NewsItem.__table__).prefix_with("IGNORE"), rows)
+                session.commit()
             except Exception as e:
                 session.rollback()
                 logger.error(
-                    f"Failed to save last news GID {news_gid} for guild {guild_id}, appid {appid}: {e}",
-                    exc_info=True,
+                    f"Failed to archive {len(rows)} news items: {e}", exc_info=True
                 )
 
-    def fetch_latest_news(seld, appid: int, count: int = 1) -> List[Dict[str, Any]]:
+    async def get_archived_news(
+        self, appid: int, limit: int = 1
+    ) -> List[Dict[str, Any]]:
         """
-        Fetches the latest news items for a given app ID from the Steam API.
+        Retrieves a game's newest archived news items without calling Steam.
+
+        Items are served from the hot cache when it holds enough of them and
+        the entry is younger than `ARCHIVE_CACHE_TTL_SECONDS`, and loaded from
+        the `news_items` table otherwise.
 
         Args:
             appid (int): The Steam Application ID for the game.
-            count (int, optional): The number of news items to fetch. Defaults to 1.
+            limit (int, optional): The maximum number of items to return. Defaults to 1.
 
         Returns:
-            List[Dict[str, Any]]: A list of dictionaries, where each dictionary represents a news item. Returns an empty list on error.
+            List[Dict[str, Any]]: The archived news items, newest first, in the same shape as Steam API items.
         """
+        cached = self._archive_cache.get(appid)
+        if cached is not None:
+            checked_at, items = cached
+            if (
+                len(items) >= limit
+                and time.monotonic() - checked_at < ARCHIVE_CACHE_TTL_SECONDS
+            ):
+                self._archive_cache.move_to_end(appid)
+                return items[:limit]
+
+        items = await run_db(
+            self._get_archived_news, appid, max(limit, ARCHIVE_CACHE_ITEMS)
+        )
+        if items:
+            self._cache_archived_news(appid, items, checked_at=time.monotonic())
+        return items[:limit]
+
+    def refresh_cached_news(
+        self, news_by_appid: Dict[int, List[Dict[str, Any]]]
+    ) -> None:
+        """
+        Adds news items archived by another process to the hot cache.
+
+        When polling runs in a separate worker, this process never archives
+        news itself, so its cache only learns of new items when an entry
+        expires. Delivered items are added right away instead. Only apps that
+        are already cached are updated, and their expiry is unchanged, since
+        the items delivered here may not be all the app's new news.
+
+        Args:
+            news_by_appid (Dict[int, List[Dict[str, Any]]]): Steam API news items, per app ID.
+        """
+        for appid, newsitems in news_by_appid.items():
+            if appid in self._archive_cache and newsitems:
+                self._cache_archived_news(
+                    appid, [self._to_archived_item(appid, item) for item in newsitems]
+                )
+
+    def _get_archived_news(self, appid: int, limit: int) -> List[Dict[str, Any]]:
+        """Blocking implementation of `get_archived_news`, run on the database thread pool."""
+        with get_db_session() as session:
+            rows = (
+                session.query(NewsItem)
+                .filter(NewsItem.steam_id == appid)
+                .order_by(NewsItem.date.desc(), NewsItem.gid.desc())
+                .limit(limit)
+                .all()
+            )
+            return [
+                {
+                    "gid": str(row.gid),
+                    "appid": row.steam_id,
+                    "title": row.title,
+                    "url": row.url,
+                    "author": row.author,
+                    "date": row.date,
+                    "contents": row.contents or "",
+                }
+                for row in rows
+            ]
+
+    def _cache_archived_news(
+        self,
+        appid: int,
+        items: List[Dict[str, Any]],
+        checked_at: Optional[float] = None,
+    ) -> None:
+        """
+        Merges items into an app's hot cache entry, keeping the newest ones.
+
+        Args:
+            appid (int): The Steam Application ID for the game.
+            items (List[Dict[str, Any]]): The archived items to add.
+            checked_at (Optional[float], optional): The monotonic time the entry is known to be current as of. Defaults to keeping the entry's current time, or expired for a new entry.
+        """
+        previous_checked_at, cached = self._archive_cache.get(
+            appid, (float("-inf"), [])
+        )
+        merged = {int(item["gid"]): item for item in cached}
+        merged.update((int(item["gid"]), item) for item in items)
+        self._archive_cache[appid] = (
+            previous_checked_at if checked_at is None else checked_at,
+            sorted(
+                merged.values(),
+                key=lambda item: (int(item["date"]), int(item["gid"])),
+                reverse=True,
+            )[:ARCHIVE_CACHE_ITEMS],
+        )
+        self._archive_cache.move_to_end(appid)
+        while len(self._archive_cache) > ARCHIVE_CACHE_APPS:
+            self._archive_cache.popitem(last=False)
+
+    @staticmethod
+    def _to_archived_item(appid: int, item: Dict[str, Any]) -> Dict[str, Any]:
+        """Reduces a Steam API news item to the fields kept in the archive."""
+        return {
+            "gid": str(item["gid"]),
+            "appid": appid,
+            "title": item.get("title", ""),
+            "url": item.get("url", ""),
+            "author": item.get("author"),
+            "date": int(item["date"]),
+            "contents": clean_news_contents(
+                item.get("contents", ""), max_length=NEWS_FETCH_MAXLENGTH
+            ),
+        }
 
-        return fetch_steam_news(appid, count=count)
+    async def close(self) -> None:
+        """Releases the pooled HTTP connections used to reach the Steam API."""
+        await steam_client.close()
@@ -0,0 +1,237 @@
+# utils/news_poller.py
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from utils.config_manager import next_digest_at
+from utils.game_manager import GameManager
+from utils.news_manager import NewsManager
+from utils.outbox_manager import OutboxManager
+from utils.poll_scheduler import PollScheduler
+from utils.sharding import ShardFilter
+from utils.subscription_manager import SubscriptionManager
+
+logger = logging.getLogger(__name__)
+
+POLL_TICK_SECONDS = int(os.getenv("POLL_TICK_SECONDS", "30"))
+POLL_MAX_PER_TICK = int(os.getenv("POLL_MAX_PER_TICK", "200"))
+POLL_LAG_WARNING_SECONDS = int(os.getenv("POLL_LAG_WARNING_SECONDS", "120"))
+
+
+class NewsPoller:
+    def __init__(
+        self,
+        subscription_manager: SubscriptionManager,
+        news_manager: NewsManager,
+        game_manager: GameManager,
+        outbox_manager: OutboxManager,
+    ):
+        """
+        Polls the Steam API for new game news and queues it in the delivery outbox.
+
+        The poller only talks to Steam and the database, never to Discord, so
+        it can run inside the bot or in its own worker process (`poller.py`)
+        while the bot only drains the outbox. The outbox ignores deliveries
+        that are already queued, so a news item seen by two polls is still
+        delivered once.
+
+        Args:
+            subscription_manager (SubscriptionManager): Loads the subscribed games and their subscribers.
+            news_manager (NewsManager): Fetches and archives news from the Steam API.
+            game_manager (GameManager): Stores each game's polling schedule.
+            outbox_manager (OutboxManager): Queues the deliveries.
+
+        Attributes:
+            poll_scheduler (PollScheduler): Each game's adaptive polling schedule.
+        """
+        self.subscription_manager = subscription_manager
+        self.news_manager = news_manager
+        self.game_manager = game_manager
+        self.outbox_manager = outbox_manager
+        self.poll_scheduler = PollScheduler()
+
+    async def seed(self) -> None:
+        """Restores each game's polling schedule from the `games` table before the first poll."""
+        try:
+            poll_states = await self.game_manager.get_poll_states()
+        except Exception as e:
+            logger.error(f"Failed to load game poll states: {e}", exc_info=True)
+            return
+
+        for appid, (last_checked, publish_interval) in poll_states.items():
+            self.poll_scheduler.seed(appid, last_checked, publish_interval)
+
+    async def tick(
+        self,
+        shards: Optional[ShardFilter] = None,
+        guild_available: Optional[Callable[[int], bool]] = None,
+    ) -> int:
+        """
+        Polls every subscribed game whose next check is due.
+
+        Each game is polled on its own schedule, kept by the `PollScheduler`:
+        games that publish often are checked every few minutes and dormant
+        games only every couple of hours. Games are spread across their
+        interval, so each tick only polls the few that are due, capped at
+        `POLL_MAX_PER_TICK`; a tick that falls behind schedule or overruns is
+        logged as a warning. The due games are polled together and their check
+        time and publish frequency are recorded in the `games` table.
+
+        Args:
+            shards (Optional[ShardFilter], optional): Only poll games followed by guilds on these shards, and only queue those guilds' subscriptions. Defaults to every guild.
+            guild_available (Optional[Callable[[int], bool]], optional): Reports whether a guild can currently be delivered to. Guilds the bot has left are always skipped; by default every other guild is treated as available.
+
+        Returns:
+            int: The number of games polled.
+        """
+        try:
+            appids = await self.subscription_manager.get_subscribed_appids(shards)
+        except Exception as e:
+            logger.error(f"Failed to load subscribed apps: {e}", exc_info=True)
+            return 0
+
+        self.poll_scheduler.sync(appids)
+        due = self.poll_scheduler.pop_due(limit=POLL_MAX_PER_TICK)
+        if self.poll_scheduler.lag > POLL_LAG_WARNING_SECONDS:
+            logger.warning(
+                f"Polling is falling behind: the most overdue app waited {self.poll_scheduler.lag:.0f}s, and {self.poll_scheduler.backlog} more apps are still due."
+            )
+        if not due:
+            return 0
+
+        started = time.monotonic()
+
+        news_by_appid = {}
+        try:
+            news_by_appid = await self._poll_apps(due, shards, guild_available)
+        except Exception as e:
+            logger.error(f"Unhandled exception polling apps: {e}", exc_info=True)
+        finally:
+            await self._record_polls(due, news_by_appid)
+
+        elapsed = time.monotonic() - started
+        if elapsed > POLL_TICK_SECONDS:
+            logger.warning(
+                f"Polling {len(due)} apps took {elapsed:.1f}s, longer than the {POLL_TICK_SECONDS}s tick."
+            )
+        return len(due)
+
+    async def _poll_apps(
+        self,
+        appids: List[int],
+        shards: Optional[ShardFilter],
+        guild_available: Optional[Callable[[int], bool]],
+    ) -> Dict[int, List[dict]]:
+        """
+        Fetches news for a set of games and queues it for their subscribers.
+
+        This runs in two phases. First, it loads a snapshot of the games'
+        subscriptions and their guild's settings in one query, and concurrently
+        fetches a window of recent news once for each game. Second, it queues
+        every news item newer than a subscription's last sent GID in the
+        delivery outbox, oldest first, so Steam requests scale with the number
+        of games rather than the number of subscriptions, and several
+        announcements between polls are all delivered. Each item is addressed
+        to the subscription's channel override if it has one, and otherwise to
+        the guild's channel. Items for a guild in digest mode are held until
+        its digest window closes.
+
+        Args:
+            appids (List[int]): The Steam Application IDs to poll.
+            shards (Optional[ShardFilter]): Only queue subscriptions of guilds on these shards.
+            guild_available (Optional[Callable[[int], bool]]): Reports whether a guild can currently be delivered to.
+
+        Returns:
+            Dict[int, List[dict]]: The news items fetched per app ID, oldest first.
+        """
+        # --- Phase 1: load the subscription snapshot and fetch news once per appid ---
+        plan = await self.subscription_manager.get_delivery_plan(appids, shards)
+
+        oldest_gids = {}
+        for appid, targets in list(plan.items()):
+            if guild_available is not None:
+                targets = [t for t in targets if guild_available(t.guild_id)]
+            if not targets:
+                del plan[appid]
+                continue
+            plan[appid] = targets
+            gids = [target.last_gid for target in targets if target.last_gid]
+            oldest_gids[appid] = min(gids) if gids else None
+
+        news_by_appid = await self.news_manager.fetch_new_news(oldest_gids)
+        await self.news_manager.archive_news(news_by_appid)
+
+        fetched = sum(1 for newsitems in news_by_appid.values() if newsitems)
+        logger.info(f"Fetched news for {fetched} of {len(appids)} due apps.")
+
+        # --- Phase 2: queue every unseen news item for its subscribers, in order ---
+        now = datetime.utcnow()
+        deliveries = []
+        for appid, newsitems in news_by_appid.items():
+            if not newsitems:
+                logger.debug(f"No news found for appid {appid}.")
+                continue
+
+            for target in plan[appid]:
+                channel_id = target.destination_channel_id
+                if not channel_id:
+                    logger.debug(
+                        f"No channel configured for appid {appid} in guild {target.guild_id}. Skipping."
+                    )
+                    continue
+
+                if target.last_gid:
+                    unseen = [
+                        item for item in newsitems if int(item["gid"]) > target.last_gid
+                    ]
+                else:
+                    # A new subscription only receives the latest item, not the backlog.
+                    unseen = newsitems[-1:]
+
+                if not unseen:
+                    logger.debug(
+                        f"No news newer than stored GID {target.last_gid} for appid {appid} in guild {target.guild_id}. Skipping."
+                    )
+                    continue
+
+                deliver_at = None
+                if target.digest_enabled:
+                    deliver_at = next_digest_at(target.digest_interval_minutes, now)
+
+                for item in unseen:
+                    deliveries.append(
+                        {
+                            "guild_id": target.guild_id,
+                            "appid": appid,
+                            "channel_id": channel_id,
+                            "news_item": item,
+                            "deliver_at": deliver_at,
+                        }
+                    )
+
+        await self.outbox_manager.enqueue(deliveries)
+        return news_by_appid
+
+    async def _record_polls(
+        self, appids: List[int], news_by_appid: Dict[int, List[dict]]
+    ) -> None:
+        """
+        Reschedules polled games and records their poll in the database.
+
+        Args:
+            appids (List[int]): The Steam Application IDs that were due.
+            news_by_appid (Dict[int, List[dict]]): The news items fetched per app ID. Apps missing from it are rescheduled with no new observations.
+        """
+        checked_at = datetime.utcnow()
+        polls = {}
+        for appid in appids:
+            self.poll_scheduler.record_poll(appid, news_by_appid.get(appid, []))
+            publish_interval = self.poll_scheduler.publish_intervals.get(appid)
+            polls[appid] = (
+                checked_at,
+                int(publish_interval) if publish_interval else None,
+            )
+
+        await self.game_manager.record_polls(polls)
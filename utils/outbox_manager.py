@@ -0,0 +1,267 @@
+import json
+import logging
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import bindparam, delete, insert, update
+
+from utils.bot_database import PendingDelivery, get_db_session, run_db
+from utils.sharding import ShardFilter
+
+logger = logging.getLogger(__name__)
+
+# --- Outbox Configuration ---
+OUTBOX_MAX_ATTEMPTS = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "8"))
+OUTBOX_RETRY_BASE_SECONDS = float(os.getenv("OUTBOX_RETRY_BASE_SECONDS", "30"))
+OUTBOX_RETRY_MAX_SECONDS = float(os.getenv("OUTBOX_RETRY_MAX_SECONDS", "3600"))
+OUTBOX_RETENTION_DAYS = int(os.getenv("OUTBOX_RETENTION_DAYS", "7"))
+
+
+class OutboxDelivery(NamedTuple):
+    """A queued delivery of one news item to one channel."""
+
+    delivery_id: int
+    guild_id: int
+    appid: int
+    channel_id: int
+    news_gid: int
+    news_item: Dict[str, Any]
+    attempts: int
+
+
+class OutboxManager:
+    def __init__(self):
+        """
+        Manages the durable outbox of pending news deliveries in the database.
+
+        This class provides a clean interface for interacting with the
+        `delivery_outbox` table. The update cycle queues deliveries here instead
+        of sending them directly, and a background sender drains the table,
+        retrying failed sends with exponential backoff. Because queued rows
+        survive restarts and a subscription's last sent GID is only advanced
+        after a send is confirmed, news items are delivered at least once.
+
+        Sent rows are kept for `OUTBOX_RETENTION_DAYS` so that the unique
+        (server, game, GID) constraint keeps a news item from being queued twice.
+        """
+        logger.info("OutboxManager initialized for database operations.")
+
+    async def enqueue(self, deliveries: List[Dict[str, Any]]) -> int:
+        """
+        Queues news deliveries in the outbox.
+
+        Deliveries that are already queued (or were already sent) for the same
+        guild, game and news GID are ignored. A delivery with a `deliver_at`
+        time, such as one collected for a digest, is held until then.
+
+        Args:
+            deliveries (List[Dict[str, Any]]): Deliveries with `guild_id`, `appid`, `channel_id` and `news_item` keys, and an optional `deliver_at` naive UTC datetime.
+
+        Returns:
+            int: The number of deliveries newly queued.
+        """
+        if not deliveries:
+            return 0
+        return await run_db(self._enqueue, deliveries)
+
+    def _enqueue(self, deliveries: List[Dict[str, Any]]) -> int:
+        """Blocking implementation of `enqueue`, run on the database thread pool."""
+        now = datetime.utcnow()
+        rows = [
+            {
+                "server_id": delivery["guild_id"],
+                "steam_id": delivery["appid"],
+                "channel_id": delivery["channel_id"],
+                "news_gid": int(delivery["news_item"]["gid"]),
+                "payload": json.dumps(delivery["news_item"]),
+                "status": PendingDelivery.STATUS_PENDING,
+                "attempts": 0,
+                "next_attempt_at": delivery.get("deliver_at") or now,
+                "created_at": now,
+            }
+            for delivery in deliveries
+        ]
+
+        with get_db_session() as session:
+            try:
+                result = session.execute(
+                    insert(PendingDelivery.__table__).prefix_with("IGNORE"), rows
+                )
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                logger.error(
+                    f"Failed to queue {len(rows)} deliveries: {e}", exc_info=True
+                )
+                return 0
+
+        queued = max(result.rowcount, 0)
+        logger.info(f"Queued {queued} of {len(rows)} deliveries in the outbox.")
+        return queued
+
+    async def get_due(
+        self, limit: int = 100, shards: Optional[ShardFilter] = None
+    ) -> List[OutboxDelivery]:
+        """
+        Retrieves pending deliveries whose next attempt time has passed.
+
+        Args:
+            limit (int, optional): The maximum number of deliveries to return. Defaults to 100.
+            shards (Optional[ShardFilter], optional): Only return deliveries to guilds on these shards. Defaults to every guild.
+
+        Returns:
+            List[OutboxDelivery]: The due deliveries, oldest first.
+        """
+        return await run_db(self._get_due, limit, shards)
+
+    def _get_due(
+        self, limit: int, shards: Optional[ShardFilter]
+    ) -> List[OutboxDelivery]:
+        """Blocking implementation of `get_due`, run on the database thread pool."""
+        with get_db_session() as session:
+            query = session.query(PendingDelivery).filter(
+                PendingDelivery.status == PendingDelivery.STATUS_PENDING,
+                PendingDelivery.next_attempt_at <= datetime.utcnow(),
+            )
+            if shards is not None and not shards.is_everything:
+                query = query.filter(shards.clause(PendingDelivery.server_id))
+            rows = query.order_by(PendingDelivery.delivery_id).limit(limit).all()
+            return [
+                OutboxDelivery(
+                    row.delivery_id,
+                    row.server_id,
+                    row.steam_id,
+                    row.channel_id,
+                    row.news_gid,
+                    json.loads(row.payload),
+                    row.attempts,
+                )
+                for row in rows
+            ]
+
+    async def mark_sent(self, delivery_ids: List[int]) -> None:
+        """
+        Marks deliveries as confirmed sent.
+
+        Args:
+            delivery_ids (List[int]): The IDs of the deliveries that were sent.
+        """
+        if delivery_ids:
+            await run_db(self._mark_sent, delivery_ids)
+
+    def _mark_sent(self, delivery_ids: List[int]) -> None:
+        """Blocking implementation of `mark_sent`, run on the database thread pool."""
+        with get_db_session() as session:
+            try:
+                session.execute(
+                    update(PendingDelivery)
+                    .where(PendingDelivery.delivery_id.in_(delivery_ids))
+                    .values(
+                        status=PendingDelivery.STATUS_SENT, sent_at=datetime.utcnow()
+                    )
+                )
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+
+    async def reschedule(
+        self, deliveries: List[OutboxDelivery]
+    ) -> List[OutboxDelivery]:
+        """
+        Records a failed send attempt for each delivery and schedules a retry.
+
+        Retries back off exponentially with jitter, starting at
+        `OUTBOX_RETRY_BASE_SECONDS` and capped at `OUTBOX_RETRY_MAX_SECONDS`. A
+        delivery that fails `OUTBOX_MAX_ATTEMPTS` times is marked as failed and
+        is no longer retried.
+
+        Args:
+            deliveries (List[OutboxDelivery]): The deliveries whose send failed.
+
+        Returns:
+            List[OutboxDelivery]: The deliveries that were given up on and marked as failed.
+        """
+        if not deliveries:
+            return []
+        return await run_db(self._reschedule, deliveries)
+
+    def _reschedule(self, deliveries: List[OutboxDelivery]) -> List[OutboxDelivery]:
+        """Blocking implementation of `reschedule`, run on the database thread pool."""
+        now = datetime.utcnow()
+        params = []
+        given_up = []
+        for delivery in deliveries:
+            attempts = delivery.attempts + 1
+            delay = min(
+                OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1),
+                OUTBOX_RETRY_MAX_SECONDS,
+            )
+            delay *= random.uniform(0.5, 1.0)
+            status = (
+                PendingDelivery.STATUS_FAILED
+                if attempts >= OUTBOX_MAX_ATTEMPTS
+                else PendingDelivery.STATUS_PENDING
+            )
+            if status == PendingDelivery.STATUS_FAILED:
+                given_up.append(delivery)
+                logger.warning(
+                    f"Giving up on delivery {delivery.delivery_id} of GID {delivery.news_gid} to guild {delivery.guild_id} after {attempts} attempts."
+                )
+            params.append(
+                {
+                    "b_delivery_id": delivery.delivery_id,
+                    "b_attempts": attempts,
+                    "b_status": status,
+                    "b_next_attempt_at": now + timedelta(seconds=delay),
+                }
+            )
+
+        table = PendingDelivery.__table__
+        stmt = (
+            update(table)
+            .where(table.c.delivery_id == bindparam("b_delivery_id"))
+            .values(
+                attempts=bindparam("b_attempts"),
+                status=bindparam("b_status"),
+                next_attempt_at=bindparam("b_next_attempt_at"),
+            )
+        )
+
+        with get_db_session() as session:
+            try:
+                session.execute(stmt, params)
+                session.commit()
+            except Exception:
+                session.rollback()
+                raise
+        return given_up
+
+    async def purge(self) -> int:
+        """
+        Deletes sent and failed deliveries older than the retention period.
+
+        Returns:
+            int: The number of deliveries deleted.
+        """
+        return await run_db(self._purge)
+
+    def _purge(self) -> int:
+        """Blocking implementation of `purge`, run on the database thread pool."""
+        cutoff = datetime.utcnow() - timedelta(days=OUTBOX_RETENTION_DAYS)
+        with get_db_session() as session:
+            try:
+                result = session.execute(
+                    delete(PendingDelivery).where(
+                        PendingDelivery.status != PendingDelivery.STATUS_PENDING,
+                        PendingDelivery.created_at < cutoff,
+                    )
+                )
+                session.commit()
+                return result.rowcount
+            except Exception as e:
+                session.rollback()
+                logger.error(f"Failed to purge the delivery outbox: {e}", exc_info=True)
+                return 0
@@ -0,0 +1,224 @@
+import heapq
+import logging
+import os
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# --- Polling Configuration ---
+POLL_MIN_INTERVAL = int(os.getenv("POLL_MIN_INTERVAL_SECONDS", str(5 * 60)))
+POLL_MAX_INTERVAL = int(os.getenv("POLL_MAX_INTERVAL_SECONDS", str(2 * 60 * 60)))
+POLL_DEFAULT_INTERVAL = int(os.getenv("POLL_DEFAULT_INTERVAL_SECONDS", str(15 * 60)))
+# A game is polled this many times per expected gap between its news posts.
+POLLS_PER_PUBLISH = 20
+# Weight of the newest observation in the publish interval moving average.
+PUBLISH_INTERVAL_SMOOTHING = 0.3
+# Each rescheduled poll is moved by up to this fraction of its interval.
+POLL_JITTER = 0.1
+
+
+class PollScheduler:
+    def __init__(self):
+        """
+        Initializes a per-game polling schedule.
+
+        Each subscribed game has its own next-due time, kept in a priority queue
+        so the due games can be popped in order. After a game is polled, its next
+        poll is scheduled from its observed publish frequency and how recently it
+        last published: active games are polled as often as `POLL_MIN_INTERVAL`
+        and dormant ones as rarely as `POLL_MAX_INTERVAL`.
+
+        To keep Steam, Discord and database load flat, games that join the
+        schedule (or are found overdue at startup) are placed in a stable,
+        hash-based slot across their interval rather than all at once, and every
+        reschedule adds a little jitter so polls do not drift back into bursts.
+        `pop_due` reports how far behind schedule the poller is.
+
+        Attributes:
+            publish_intervals (Dict[int, float]): A moving average of the seconds between news posts, per app ID.
+            last_published (Dict[int, int]): The Unix timestamp of the newest news item seen, per app ID.
+            intervals (Dict[int, int]): The current polling interval in seconds, per app ID.
+            lag (float): How many seconds the most overdue game returned by the last `pop_due` had waited.
+            backlog (int): How many due games the last `pop_due` left behind because of its limit.
+        """
+        self.publish_intervals: Dict[int, float] = {}
+        self.last_published: Dict[int, int] = {}
+        self.intervals: Dict[int, int] = {}
+        self.lag = 0.0
+        self.backlog = 0
+
+        self._heap: List[Tuple[float, int]] = []
+        self._due_at: Dict[int, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._due_at)
+
+    def __contains__(self, appid: int) -> bool:
+        return appid in self._due_at
+
+    def seed(
+        self,
+        appid: int,
+        last_checked: Optional[datetime],
+        publish_interval: Optional[int],
+    ) -> None:
+        """
+        Restores a game's persisted polling state.
+
+        Args:
+            appid (int): The Steam Application ID for the game.
+            last_checked (Optional[datetime]): When the game was last polled (naive UTC), if ever.
+            publish_interval (Optional[int]): The game's recorded average seconds between news posts, if known.
+        """
+        if publish_interval:
+            self.publish_intervals[appid] = float(publish_interval)
+        interval = self._interval_for(appid, time.time())
+        self.intervals[appid] = interval
+
+        if last_checked is not None:
+            now = time.time()
+            checked_at = last_checked.replace(tzinfo=timezone.utc).timestamp()
+            due_at = checked_at + interval
+            if due_at < now:
+                due_at = now + self._slot(appid, interval)
+            self._schedule(appid, due_at)
+
+    def sync(self, appids: Iterable[int], now: Optional[float] = None) -> None:
+        """
+        Brings the schedule in line with the set of currently subscribed games.
+
+        Newly subscribed games are placed in their hash slot within the default
+        interval, and games no one is subscribed to anymore are dropped.
+
+        Args:
+            appids (Iterable[int]): The app IDs that have at least one subscriber.
+            now (Optional[float], optional): The current Unix time. Defaults to the time of the call.
+        """
+        now = time.time() if now is None else now
+        appids = set(appids)
+
+        for appid in appids - self._due_at.keys():
+            self._schedule(appid, now + self._slot(appid, POLL_DEFAULT_INTERVAL))
+
+        for appid in self._due_at.keys() - appids:
+            del self._due_at[appid]
+            self.intervals.pop(appid, None)
+
+    def pop_due(
+        self, now: Optional[float] = None, limit: Optional[int] = None
+    ) -> List[int]:
+        """
+        Removes and returns the games whose next poll is due.
+
+        After the call, `lag` holds how long the most overdue returned game had
+        waited and `backlog` how many due games were left for a later call.
+
+        Args:
+            now (Optional[float], optional): The current Unix time. Defaults to the time of the call.
+            limit (Optional[int], optional): The maximum number of games to return. Defaults to no limit.
+
+        Returns:
+            List[int]: The due app IDs, most overdue first.
+        """
+        now = time.time() if now is None else now
+        due = []
+        self.lag = 0.0
+        while self._heap and self._heap[0][0] <= now:
+            if limit is not None and len(due) >= limit:
+                break
+            due_at, appid = heapq.heappop(self._heap)
+            # Entries superseded by a later reschedule are skipped lazily.
+            if self._due_at.get(appid) == due_at:
+                del self._due_at[appid]
+                due.append(appid)
+                self.lag = max(self.lag, now - due_at)
+
+        self.backlog = sum(1 for due_at in self._due_at.values() if due_at <= now)
+        return due
+
+    def record_poll(
+        self,
+        appid: int,
+        newsitems: List[Dict[str, Any]],
+        now: Optional[float] = None,
+    ) -> int:
+        """
+        Updates a game's publish statistics from a poll and schedules its next poll.
+
+        Args:
+            appid (int): The Steam Application ID for the game.
+            newsitems (List[Dict[str, Any]]): The news items fetched for the game, in any order.
+            now (Optional[float], optional): The current Unix time. Defaults to the time of the call.
+
+        Returns:
+            int: The interval in seconds until the game's next poll.
+        """
+        now = time.time() if now is None else now
+
+        dates = sorted(int(item["date"]) for item in newsitems)
+        if dates:
+            previous = self.last_published.get(appid)
+            self.last_published[appid] = max(dates[-1], previous or 0)
+
+            # Only gaps that end at a post not seen on an earlier poll feed the
+            # moving average, so refetched items are not counted twice.
+            if previous:
+                dates = [previous] + [date for date in dates if date > previous]
+            gaps = [later - earlier for earlier, later in zip(dates, dates[1:])]
+            for gap in gaps:
+                if gap > 0:
+                    self._observe_gap(appid, gap)
+
+        interval = self._interval_for(appid, now)
+        self.intervals[appid] = interval
+        jitter = random.uniform(-POLL_JITTER, POLL_JITTER) * interval
+        self._schedule(appid, now + interval + jitter)
+        return interval
+
+    def _observe_gap(self, appid: int, gap: float) -> None:
+        """Blends an observed gap between posts into the publish interval average."""
+        current = self.publish_intervals.get(appid)
+        if current is None:
+            self.publish_intervals[appid] = gap
+        else:
+            self.publish_intervals[appid] = (
+                PUBLISH_INTERVAL_SMOOTHING * gap
+                + (1 - PUBLISH_INTERVAL_SMOOTHING) * current
+            )
+
+    def _interval_for(self, appid: int, now: float) -> int:
+        """
+        Computes a game's polling interval.
+
+        The interval is a fraction of the shorter of the game's average publish
+        interval and the time since its last post, clamped to the configured
+        bounds. Games with no history use `POLL_DEFAULT_INTERVAL`.
+        """
+        candidates = []
+        if appid in self.publish_intervals:
+            candidates.append(self.publish_intervals[appid])
+        if appid in self.last_published:
+            candidates.append(max(now - self.last_published[appid], 0))
+        if not candidates:
+            return POLL_DEFAULT_INTERVAL
+
+        interval = min(candidates) / POLLS_PER_PUBLISH
+        return int(min(max(interval, POLL_MIN_INTERVAL), POLL_MAX_INTERVAL))
+
+    @staticmethod
+    def _slot(appid: int, interval: float) -> float:
+        """
+        Returns a game's stable offset within an interval.
+
+        App IDs are spread with a multiplicative hash so that neighbouring IDs
+        land far apart and a set of games fills the interval uniformly.
+        """
+        return ((appid * 2654435761) % 2**32) / 2**32 * interval
+
+    def _schedule(self, appid: int, due_at: float) -> None:
+        """Sets a game's next-due time."""
+        self._due_at[appid] = due_at
+        heapq.heappush(self._heap, (due_at, appid))
@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float):
+        """
+        Initializes an asynchronous token-bucket rate limiter.
+
+        The bucket starts full and refills continuously at `rate` tokens per
+        second up to `capacity`. Callers wait in `acquire` until a token is
+        available, so bursts up to `capacity` pass immediately and sustained
+        traffic is smoothed to `rate`.
+
+        Args:
+            rate (float): The number of tokens added per second.
+            capacity (float): The maximum number of tokens the bucket can hold.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        """Adds the tokens accumulated since the last refill."""
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    async def acquire(self, tokens: float = 1) -> None:
+        """
+        Waits until `tokens` tokens are available and consumes them.
+
+        Waiters are served in arrival order.
+
+        Args:
+            tokens (float, optional): The number of tokens to consume. Defaults to 1.
+        """
+        async with self._lock:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+    @property
+    def available(self) -> float:
+        """The number of tokens currently available."""
+        self._refill()
+        return self._tokens
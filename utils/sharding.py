@@ -0,0 +1,93 @@
+import os
+from typing import FrozenSet, Iterable, List, NamedTuple, Optional
+
+from sqlalchemy import func, true
+
+# --- Sharding Configuration ---
+# The total number of shards across every process. Unset lets Discord choose.
+SHARD_COUNT: Optional[int] = (
+    int(os.getenv("SHARD_COUNT")) if os.getenv("SHARD_COUNT") else None
+)
+# The shards this process runs, e.g. "0,1,2,3". Unset runs every shard.
+SHARD_IDS: Optional[List[int]] = [
+    int(shard_id)
+    for shard_id in os.getenv("SHARD_IDS", "").split(",")
+    if shard_id.strip()
+] or None
+
+
+def shard_id_for(guild_id: int, shard_count: int) -> int:
+    """
+    Computes which shard a guild belongs to, using Discord's sharding formula.
+
+    Args:
+        guild_id (int): The unique ID of the Discord guild.
+        shard_count (int): The total number of shards.
+
+    Returns:
+        int: The guild's shard ID.
+    """
+    return (guild_id >> 22) % shard_count
+
+
+class ShardFilter(NamedTuple):
+    """The set of shards, and so of guilds, that a worker is responsible for."""
+
+    shard_count: int
+    shard_ids: FrozenSet[int]
+
+    @classmethod
+    def for_shards(cls, shard_count: int, shard_ids: Iterable[int]) -> "ShardFilter":
+        """Builds a filter for some of the shards of a bot."""
+        return cls(shard_count, frozenset(shard_ids))
+
+    @classmethod
+    def from_bot(cls, bot) -> "ShardFilter":
+        """
+        Builds a filter for every shard a connected bot runs.
+
+        Args:
+            bot (commands.Bot): The bot instance. Unsharded bots count as one shard.
+
+        Returns:
+            ShardFilter: The filter for the bot's shards.
+        """
+        shard_count = bot.shard_count or 1
+        shard_ids = getattr(bot, "shard_ids", None) or range(shard_count)
+        return cls.for_shards(shard_count, shard_ids)
+
+    @property
+    def is_everything(self) -> bool:
+        """Whether the filter covers every shard, so no filtering is needed."""
+        return len(self.shard_ids) >= self.shard_count
+
+    def owns(self, guild_id: int) -> bool:
+        """
+        Reports whether a guild is handled by one of the filter's shards.
+
+        Args:
+            guild_id (int): The unique ID of the Discord guild.
+
+        Returns:
+            bool: True if the guild belongs to one of the shards.
+        """
+        return (
+            self.is_everything
+            or shard_id_for(guild_id, self.shard_count) in self.shard_ids
+        )
+
+    def clause(self, guild_id_column):
+        """
+        Builds a SQL condition selecting the rows of guilds on the filter's shards.
+
+        Args:
+            guild_id_column: The column holding the Discord guild ID.
+
+        Returns:
+            The SQLAlchemy boolean expression, always true when the filter covers every shard.
+        """
+        if self.is_everything:
+            return true()
+        return func.mod(guild_id_column.op(">>")(22), self.shard_count).in_(
+            sorted(self.shard_ids)
+        )
@@ -1,36 +1,293 @@
-# utils/steam_api.py
+import asyncio
 import logging
+import os
+import random
+import time
+from collections import Counter
+from typing import Any, Dict, Optional
 
-import requests
+import aiohttp
+
+from utils.rate_limiter import TokenBucket
 
 logger = logging.getLogger(__name__)
 
 STEAM_NEWS_URL = "https://api.steampowered.com/ISteamNews/GetNewsForApp/v2/"
 
+# --- Client Configuration ---
+STEAM_MAX_CONCURRENCY = int(os.getenv("STEAM_MAX_CONCURRENCY", "20"))
+STEAM_REQUEST_TIMEOUT = float(os.getenv("STEAM_REQUEST_TIMEOUT", "10"))
+STEAM_RATE_LIMIT = float(os.getenv("STEAM_RATE_LIMIT", "10"))
+STEAM_MAX_RETRIES = int(os.getenv("STEAM_MAX_RETRIES", "3"))
+STEAM_BACKOFF_BASE = float(os.getenv("STEAM_BACKOFF_BASE", "1"))
+STEAM_BACKOFF_MAX = float(os.getenv("STEAM_BACKOFF_MAX", "30"))
+STEAM_BREAKER_THRESHOLD = int(os.getenv("STEAM_BREAKER_THRESHOLD", "5"))
+STEAM_BREAKER_RESET = float(os.getenv("STEAM_BREAKER_RESET", "60"))
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(
+        self,
+        failure_threshold: int = STEAM_BREAKER_THRESHOLD,
+        reset_timeout: float = STEAM_BREAKER_RESET,
+    ):
+        """
+        Initializes a circuit breaker that fails fast while a service is unhealthy.
+
+        After `failure_threshold` consecutive failures the breaker opens and
+        rejects every request for `reset_timeout` seconds. It then lets a single
+        trial request through (half-open): a success closes the breaker, and a
+        failure opens it again.
+
+        Args:
+            failure_threshold (int, optional): The consecutive failures that open the breaker. Defaults to STEAM_BREAKER_THRESHOLD.
+            reset_timeout (float, optional): The seconds to stay open before a trial request. Defaults to STEAM_BREAKER_RESET.
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow_request(self) -> bool:
+        """
+        Reports whether a request may be attempted now.
+
+        Returns:
+            bool: False while the breaker is open, or while a half-open trial request is still running.
+        """
+        if self.state == self.OPEN:
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return False
+            self.state = self.HALF_OPEN
+            self._trial_in_flight = False
+
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+
+        return True
+
+    def record_success(self) -> None:
+        """Closes the breaker after a successful request."""
+        if self.state != self.CLOSED:
+            logger.info("Steam API circuit breaker closed.")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Counts a failed request, opening the breaker if the threshold is reached."""
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if (
+            self.state == self.HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            if self.state != self.OPEN:
+                logger.warning(
+                    f"Steam API circuit breaker opened after {self.consecutive_failures} consecutive failures. Failing fast for {self.reset_timeout:.0f}s."
+                )
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
+
+
+class SteamClient:
+    def __init__(
+        self,
+        max_concurrency: int = STEAM_MAX_CONCURRENCY,
+        timeout: float = STEAM_REQUEST_TIMEOUT,
+        rate_limit: float = STEAM_RATE_LIMIT,
+    ):
+        """
+        Initializes an asynchronous client for the Steam Web API.
+
+        The client lazily opens a single `aiohttp.ClientSession` whose keep-alive
+        connection pool is shared by every request, and bounds the number of
+        requests in flight with a semaphore so that a large polling cycle does not
+        open hundreds of sockets at once.
+
+        Every request also takes a token from a shared token bucket, so the bot
+        never exceeds `rate_limit` requests per second. Timeouts, 429 and 5xx
+        responses, and responses that are not JSON, are retried with
+        exponential backoff and full jitter, honoring `Retry-After`. A
+        `CircuitBreaker` stops calling Steam entirely while it keeps failing,
+        so a degraded Steam costs seconds per cycle instead of a full timeout
+        for every app. Per-endpoint counters are available from `health`.
+
+        Args:
+            max_concurrency (int, optional): The maximum number of concurrent requests. Defaults to STEAM_MAX_CONCURRENCY.
+            timeout (float, optional): The total timeout for a single request, in seconds. Defaults to STEAM_REQUEST_TIMEOUT.
+            rate_limit (float, optional): The maximum requests per second. Defaults to STEAM_RATE_LIMIT.
+        """
+        self.max_concurrency = max_concurrency
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+        self.rate_limiter = TokenBucket(rate=rate_limit, capacity=rate_limit)
+        self.breaker = CircuitBreaker()
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._health: Dict[str, Counter] = {}
+        self._latency: Dict[str, float] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Returns the shared HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_concurrency, keepalive_timeout=60
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, timeout=self.timeout
+            )
+        return self._session
+
+    async def _get_json(
+        self, endpoint: str, url: str, params: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Sends a GET request through the rate limiter, retries and circuit breaker.
+
+        Args:
+            endpoint (str): A short name for the endpoint, used for health counters.
+            url (str): The URL to request.
+            params (Dict[str, Any]): The query parameters.
+
+        Returns:
+            Optional[Dict[str, Any]]: The decoded JSON response, or None if the request failed or was short-circuited.
+        """
+        health = self._health.setdefault(endpoint, Counter())
+
+        for attempt in range(STEAM_MAX_RETRIES + 1):
+            if not self.breaker.allow_request():
+                health["short_circuited"] += 1
+                return None
+
+            await self.rate_limiter.acquire()
+            health["requests"] += 1
+            retry_after = 0.0
+            started = time.monotonic()
+
+            try:
+                async with self._semaphore:
+                    session = self._get_session()
+                    async with session.get(url, params=params) as response:
+                        if response.status == 429 or response.status >= 500:
+                            health[
+                                (
+                                    "rate_limited"
+                                    if response.status == 429
+                                    else "server_errors"
+                                )
+                            ] += 1
+                            retry_after = float(
+                                response.headers.get("Retry-After", 0) or 0
+                            )
+                            error = f"HTTP {response.status}"
+                        else:
+                            response.raise_for_status()
+                            data = await response.json()
+                            self._latency[endpoint] = time.monotonic() - started
+                            health["successes"] += 1
+                            self.breaker.record_success()
+                            return data
+            except aiohttp.ContentTypeError as e:
+                # A 200 with a non-JSON body, such as a maintenance page, means
+                # Steam is degraded. ContentTypeError subclasses
+                # ClientResponseError, so it must be caught first.
+                health["bad_responses"] += 1
+                error = repr(e)
+            except aiohttp.ClientResponseError as e:
+                # Other 4xx responses mean the request itself is bad, not that
+                # Steam is unhealthy, so they are neither retried nor counted
+                # against the circuit breaker.
+                health["client_errors"] += 1
+                self.breaker.record_success()
+                logger.warning(f"Steam {endpoint} request rejected ({params}): {e}")
+                return None
+            except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+                health[
+                    (
+                        "timeouts"
+                        if isinstance(e, asyncio.TimeoutError)
+                        else "network_errors"
+                    )
+                ] += 1
+                error = repr(e)
+
+            self.breaker.record_failure()
+            health["failures"] += 1
+
+            if attempt == STEAM_MAX_RETRIES:
+                break
+
+            backoff = random.uniform(
+                0, min(STEAM_BACKOFF_MAX, STEAM_BACKOFF_BASE * 2**attempt)
+            )
+            health["retries"] += 1
+            logger.debug(
+                f"Steam {endpoint} request failed ({error}); retrying in {max(backoff, retry_after):.1f}s."
+            )
+            await asyncio.sleep(max(backoff, min(retry_after, STEAM_BACKOFF_MAX)))
+
+        logger.error(
+            f"Steam {endpoint} request failed after retries ({params}): {error}"
+        )
+        return None
+
+    async def fetch_news(
+        self, appid: int, count: int = 1, maxlength: int = 300
+    ) -> list[dict]:
+        """
+        Fetches the latest news items for a given app ID from the Steam API.
+
+        This coroutine sends an HTTP GET request to the public Steam News API and
+        retrieves a list of news items for a specified game. It handles network
+        errors and unexpected API responses gracefully.
+
+        Args:
+            appid (int): The Steam Application ID for the game.
+            count (int, optional): The number of news items to fetch. Defaults to 1.
+            maxlength (int, optional): The maximum length of the news item content. Defaults to 300.
+
+        Returns:
+            list[dict]: A list of dictionaries, where each dictionary represents a news item. Returns an empty list on error or if no news is found.
+        """
+        params = {"appid": appid, "count": count, "maxlength": maxlength}
+        data = await self._get_json("news", STEAM_NEWS_URL, params)
+        if not data:
+            return []
+        return data.get("appnews", {}).get("newsitems", [])
+
+    def health(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Reports request counters and the last latency for every endpoint.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: Counters per endpoint name, plus the circuit breaker state under "circuit".
+        """
+        report: Dict[str, Dict[str, Any]] = {
+            endpoint: {
+                **counters,
+                "last_latency_ms": round(self._latency.get(endpoint, 0) * 1000),
+            }
+            for endpoint, counters in self._health.items()
+        }
+        report["circuit"] = {
+            "state": self.breaker.state,
+            "consecutive_failures": self.breaker.consecutive_failures,
+        }
+        return report
+
+    async def close(self) -> None:
+        """Closes the shared HTTP session and its connection pool."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
 
-def fetch_steam_news(appid: int, count: int = 1, maxlength: int = 300) -> list[dict]:
-    """
-    Fetches the latest news items for a given app ID from the Steam API.
-
-    This function sends an HTTP GET request to the public Steam News API and
-    retrieves a list of news items for a specified game. It handles network
-    errors and unexpected API responses gracefully.
-
-    Args:
-        appid (int): The Steam Application ID for the game.
-        count (int, optional): The number of news items to fetch. Defaults to 1.
-        maxlength (int, optional): The maximum length of the news item content. Defaults to 300.
-
-    Returns:
-        list[dict]: A list of dictionaries, where each dictionary represents a news item. Returns an empty list on error or if no news is found.
-    """
-    params = {"appid": appid, "count": count, "maxlength": maxlength}
-    try:
-        response = requests.get(STEAM_NEWS_URL, params=params, timeout=10)
-        response.raise_for_status()
-        data = response.json()
-        newsitems = data.get("appnews", {}).get("newsitems", [])
-        return newsitems
-    except Exception as e:
-        logger.error(f"Error fetching Steam news for appid {appid}: {e}")
-        return []
+steam_client = SteamClient()
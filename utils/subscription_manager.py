@@ -1,12 +1,35 @@
 # utils/subscription_manager.py
 import logging
-from typing import List
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
 
-from utils.bot_database import DiscordServer, Game, Subscription, get_db_session
+from utils.bot_database import (
+    DiscordServer,
+    Game,
+    Subscription,
+    get_db_session,
+    run_db,
+)
+from utils.sharding import ShardFilter
 
 logger = logging.getLogger(__name__)
 
 
+class SubscriptionTarget(NamedTuple):
+    """A single subscriber of a game, as loaded for one update cycle."""
+
+    guild_id: int
+    channel_id: int
+    last_gid: Optional[int]
+    channel_id_override: Optional[int]
+    digest_enabled: bool = False
+    digest_interval_minutes: Optional[int] = None
+
+    @property
+    def destination_channel_id(self) -> Optional[int]:
+        """The channel news is delivered to: the subscription's override, else the guild's channel."""
+        return self.channel_id_override or self.channel_id
+
+
 class SubscriptionManager:
     def __init__(self):
         """
@@ -15,26 +38,201 @@ class SubscriptionManager:
         This class provides a clean interface for interactions with the `subscriptions`
         table, handling the retrieval, creation, and removal of guild-to-game
         subscriptions.
+
+        Once `load_index` has run, subscriptions are also kept in an in-memory
+        bidirectional index, kept up to date by `add_subscription` and
+        `remove_subscription`, so "which games does this guild follow" and
+        "which games does any guild follow" are answered without a query.
+        Fan-out to a game's subscribers uses `get_delivery_plan`, which also
+        loads each guild's channel and last sent news GID.
+
+        Attributes:
+            _guilds_by_app (Dict[int, Set[int]]): The subscribed guild IDs, keyed by Steam App ID.
+            _apps_by_guild (Dict[int, Set[int]]): The subscribed Steam App IDs, keyed by guild ID.
+            _index_loaded (bool): Whether the index has been loaded from the database.
         """
+        self._guilds_by_app: Dict[int, Set[int]] = {}
+        self._apps_by_guild: Dict[int, Set[int]] = {}
+        self._index_loaded = False
         logger.info("SubscriptionManager initialized for database operations.")
 
+    async def load_index(self) -> int:
+        """
+        Loads every subscription into the in-memory index with a single query.
+
+        Returns:
+            int: The number of subscriptions loaded.
+        """
+        pairs = await run_db(self._load_subscription_pairs)
+
+        guilds_by_app: Dict[int, Set[int]] = {}
+        apps_by_guild: Dict[int, Set[int]] = {}
+        for guild_id, appid in pairs:
+            guilds_by_app.setdefault(appid, set()).add(guild_id)
+            apps_by_guild.setdefault(guild_id, set()).add(appid)
+
+        self._guilds_by_app = guilds_by_app
+        self._apps_by_guild = apps_by_guild
+        self._index_loaded = True
+        logger.info(
+            f"Indexed {len(pairs)} subscriptions across {len(guilds_by_app)} apps and {len(apps_by_guild)} guilds."
+        )
+        return len(pairs)
+
+    def _load_subscription_pairs(self) -> List[Tuple[int, int]]:
+        """Blocking implementation of `load_index`, run on the database thread pool."""
+        with get_db_session() as session:
+            rows = session.query(Subscription.server_id, Subscription.steam_id).all()
+            return [(server_id, steam_id) for server_id, steam_id in rows]
+
+    def _index_add(self, guild_id: int, appid: int) -> None:
+        """Records a subscription in the in-memory index."""
+        if self._index_loaded:
+            self._guilds_by_app.setdefault(appid, set()).add(guild_id)
+            self._apps_by_guild.setdefault(guild_id, set()).add(appid)
+
+    def _index_remove(self, guild_id: int, appid: int) -> None:
+        """Removes a subscription from the in-memory index."""
+        if not self._index_loaded:
+            return
+        for index, key, value in (
+            (self._guilds_by_app, appid, guild_id),
+            (self._apps_by_guild, guild_id, appid),
+        ):
+            members = index.get(key)
+            if members is not None:
+                members.discard(value)
+                if not members:
+                    del index[key]
+
     async def get_subscriptions(self, guild_id: int) -> List[int]:
         """
         Retrieves a list of Steam App IDs to which a guild is subscribed.
 
+        This is served from the in-memory index when it is loaded.
+
         Args:
             guild_id (int): The unique ID of the Discord guild.
 
         Returns:
             List[int]: A list of Steam Application IDs.
         """
+        if self._index_loaded:
+            return list(self._apps_by_guild.get(guild_id, ()))
+        return await run_db(self._get_subscriptions, guild_id)
 
+    def _get_subscriptions(self, guild_id: int) -> List[int]:
+        """Blocking implementation of `get_subscriptions`, run on the database thread pool."""
         with get_db_session() as session:
             subscriptions = (
                 session.query(Subscription).filter_by(server_id=guild_id).all()
             )
             return [sub.steam_id for sub in subscriptions]
 
+    async def get_subscribed_appids(
+        self, shards: Optional[ShardFilter] = None
+    ) -> Set[int]:
+        """
+        Retrieves every Steam App ID that at least one guild is subscribed to.
+
+        This is served from the in-memory index when it is loaded. Otherwise,
+        as in a standalone poller, it is read from the database and only counts
+        guilds the bot is still a member of.
+
+        Args:
+            shards (Optional[ShardFilter], optional): Only count subscriptions of guilds on these shards. Defaults to every guild.
+
+        Returns:
+            Set[int]: The distinct subscribed Steam Application IDs.
+        """
+        if shards is not None and shards.is_everything:
+            shards = None
+        if self._index_loaded:
+            if shards is None:
+                return set(self._guilds_by_app)
+            return {
+                appid
+                for guild_id, appids in list(self._apps_by_guild.items())
+                if shards.owns(guild_id)
+                for appid in appids
+            }
+        return await run_db(self._get_subscribed_appids, shards)
+
+    def _get_subscribed_appids(self, shards: Optional[ShardFilter]) -> Set[int]:
+        """Blocking implementation of `get_subscribed_appids`, run on the database thread pool."""
+        with get_db_session() as session:
+            query = (
+                session.query(Subscription.steam_id)
+                .join(DiscordServer, Subscription.server_id == DiscordServer.server_id)
+                .filter(DiscordServer.active.is_(True))
+            )
+            if shards is not None:
+                query = query.filter(shards.clause(Subscription.server_id))
+            rows = query.distinct().all()
+            return {steam_id for (steam_id,) in rows}
+
+    async def get_delivery_plan(
+        self,
+        appids: Optional[Iterable[int]] = None,
+        shards: Optional[ShardFilter] = None,
+    ) -> Dict[int, List[SubscriptionTarget]]:
+        """
+        Loads subscriptions and their guild's channel in a single query.
+
+        This joins the `subscriptions` and `discord_servers` tables so an update
+        cycle can work from one in-memory snapshot instead of issuing per-guild
+        and per-subscription queries. Guilds the bot has left are skipped.
+
+        Args:
+            appids (Optional[Iterable[int]], optional): Only load subscriptions to these Steam App IDs. Defaults to all subscriptions.
+            shards (Optional[ShardFilter], optional): Only load subscriptions of guilds on these shards. Defaults to every guild.
+
+        Returns:
+            Dict[int, List[SubscriptionTarget]]: A mapping of Steam App ID to the guilds subscribed to it, with their channel, channel override, digest settings and last sent news GID.
+        """
+        appids = list(appids) if appids is not None else None
+        return await run_db(self._get_delivery_plan, appids, shards)
+
+    def _get_delivery_plan(
+        self, appids: Optional[List[int]], shards: Optional[ShardFilter]
+    ) -> Dict[int, List[SubscriptionTarget]]:
+        """Blocking implementation of `get_delivery_plan`, run on the database thread pool."""
+        plan: Dict[int, List[SubscriptionTarget]] = {}
+
+        with get_db_session() as session:
+            query = session.query(
+                Subscription.steam_id,
+                Subscription.server_id,
+                DiscordServer.channel_id,
+                Subscription.last_news_item_timestamp,
+                Subscription.channel_id_override,
+                DiscordServer.digest_enabled,
+                DiscordServer.digest_interval_minutes,
+            ).join(DiscordServer, Subscription.server_id == DiscordServer.server_id)
+            query = query.filter(DiscordServer.active.is_(True))
+            if appids is not None:
+                query = query.filter(Subscription.steam_id.in_(appids))
+            if shards is not None and not shards.is_everything:
+                query = query.filter(shards.clause(Subscription.server_id))
+            rows = query.all()
+
+        for row in rows:
+            plan.setdefault(row.steam_id, []).append(
+                SubscriptionTarget(
+                    row.server_id,
+                    row.channel_id,
+                    row.last_news_item_timestamp,
+                    row.channel_id_override,
+                    bool(row.digest_enabled),
+                    row.digest_interval_minutes,
+                )
+            )
+
+        logger.info(
+            f"Loaded delivery plan with {len(rows)} subscriptions across {len(plan)} apps."
+        )
+        return plan
+
     async def add_subscription(self, guild_id: int, appid: int) -> bool:
         """
         Adds a game subscription for a guild.
@@ -49,7 +247,13 @@ class SubscriptionManager:
         Returns:
             bool: True if the subscription was successfully added, False otherwise.
         """
+        added = await run_db(self._add_subscription, guild_id, appid)
+        if added:
+            self._index_add(guild_id, appid)
+        return added
 
+    def _add_subscription(self, guild_id: int, appid: int) -> bool:
+        """Blocking implementation of `add_subscription`, run on the database thread pool."""
         with get_db_session() as session:
             try:
                 server = (
@@ -110,7 +314,13 @@ class SubscriptionManager:
         Returns:
             bool: True if the subscription was successfully removed, False otherwise.
         """
+        removed = await run_db(self._remove_subscription, guild_id, appid)
+        if removed:
+            self._index_remove(guild_id, appid)
+        return removed
 
+    def _remove_subscription(self, guild_id: int, appid: int) -> bool:
+        """Blocking implementation of `remove_subscription`, run on the database thread pool."""
         with get_db_session() as session:
             try:
                 subscription_to_remove = (
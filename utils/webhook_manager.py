@@ -0,0 +1,237 @@
+import logging
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+import aiohttp
+import discord
+from sqlalchemy import delete
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+
+from utils.bot_database import ChannelWebhook, get_db_session, run_db
+
+logger = logging.getLogger(__name__)
+
+# --- Webhook Configuration ---
+WEBHOOK_NAME = os.getenv("WEBHOOK_NAME", "Hermes")
+WEBHOOK_MAX_CONNECTIONS = int(os.getenv("WEBHOOK_MAX_CONNECTIONS", "64"))
+WEBHOOK_TIMEOUT = float(os.getenv("WEBHOOK_TIMEOUT_SECONDS", "15"))
+# How long a channel that refused a webhook is served by `channel.send` instead.
+WEBHOOK_RETRY_SECONDS = int(os.getenv("WEBHOOK_RETRY_SECONDS", "3600"))
+
+
+class WebhookCredentials(NamedTuple):
+    """The ID and token needed to post through a webhook."""
+
+    webhook_id: int
+    token: str
+
+
+class WebhookManager:
+    def __init__(self):
+        """
+        Manages the webhooks the bot posts news through.
+
+        One webhook is created per news channel on first use, and its ID and
+        token are stored in the `channel_webhooks` table and cached in memory,
+        so it is reused across restarts. Webhook posts go through a single
+        pooled `aiohttp` session. Each webhook has its own rate limit bucket,
+        separate from the bot's, so a large fan-out is not throttled by the
+        bot-wide limits.
+
+        When a channel refuses a webhook, for example because the bot lacks
+        the Manage Webhooks permission, `send` reports it so the caller can
+        fall back to `channel.send`, and creation is not retried there for
+        `WEBHOOK_RETRY_SECONDS`. A webhook deleted by a server admin is
+        recreated on the next send.
+
+        Attributes:
+            _credentials (Dict[int, WebhookCredentials]): The cached webhooks, keyed by channel ID.
+            _unavailable (Dict[int, float]): When webhook creation may next be tried, per channel ID, as a monotonic time.
+        """
+        self._credentials: Dict[int, WebhookCredentials] = {}
+        self._unavailable: Dict[int, float] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        logger.info("WebhookManager initialized.")
+
+    async def load(self) -> int:
+        """
+        Loads every stored webhook into the cache with a single query.
+
+        Returns:
+            int: The number of webhooks loaded.
+        """
+        self._credentials = await run_db(self._load)
+        logger.info(f"Cached {len(self._credentials)} channel webhooks.")
+        return len(self._credentials)
+
+    def _load(self) -> Dict[int, WebhookCredentials]:
+        """Blocking implementation of `load`, run on the database thread pool."""
+        with get_db_session() as session:
+            rows = session.query(
+                ChannelWebhook.channel_id,
+                ChannelWebhook.webhook_id,
+                ChannelWebhook.webhook_token,
+            ).all()
+            return {
+                channel_id: WebhookCredentials(webhook_id, token)
+                for channel_id, webhook_id, token in rows
+            }
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Returns the shared HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=WEBHOOK_MAX_CONNECTIONS, keepalive_timeout=60
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=WEBHOOK_TIMEOUT),
+            )
+        return self._session
+
+    async def send(
+        self,
+        channel: discord.abc.GuildChannel,
+        content: str,
+        embeds: List[discord.Embed],
+    ) -> bool:
+        """
+        Posts a message to a channel through its webhook.
+
+        The post uses the bot's name and avatar in the channel's guild, so it
+        looks the same as a message sent by the bot.
+
+        Args:
+            channel (discord.abc.GuildChannel): The channel to post in.
+            content (str): The message text.
+            embeds (List[discord.Embed]): The embeds to attach.
+
+        Returns:
+            bool: True if the message was posted, False if the channel has no usable webhook and the caller should fall back to `channel.send`.
+
+        Raises:
+            discord.HTTPException: If Discord rejected the post for another reason.
+        """
+        me = channel.guild.me
+        for _ in range(2):
+            webhook = await self._get_webhook(channel)
+            if webhook is None:
+                return False
+            try:
+                await webhook.send(
+                    content,
+                    embeds=embeds,
+                    username=me.display_name,
+                    avatar_url=me.display_avatar.url,
+                )
+                return True
+            except discord.NotFound:
+                logger.info(
+                    f"Webhook for channel {channel.id} in guild {channel.guild.id} was deleted. Recreating it."
+                )
+                await self._forget(channel.id)
+        return False
+
+    async def _get_webhook(
+        self, channel: discord.abc.GuildChannel
+    ) -> Optional[discord.Webhook]:
+        """Returns a channel's webhook, creating it if the channel has none yet."""
+        credentials = self._credentials.get(channel.id)
+        if credentials is None:
+            if time.monotonic() < self._unavailable.get(channel.id, 0):
+                return None
+            credentials = await self._create(channel)
+            if credentials is None:
+                return None
+
+        return discord.Webhook.partial(
+            credentials.webhook_id, credentials.token, session=self._get_session()
+        )
+
+    async def _create(
+        self, channel: discord.abc.GuildChannel
+    ) -> Optional[WebhookCredentials]:
+        """Creates and stores a webhook in a channel, or returns None if the channel refuses it."""
+        if not hasattr(channel, "create_webhook"):
+            return None
+
+        try:
+            webhook = await channel.create_webhook(
+                name=WEBHOOK_NAME, reason="News delivery"
+            )
+        except discord.Forbidden:
+            logger.warning(
+                f"Bot lacks permission to create a webhook in channel {channel.id} of guild {channel.guild.id}. Falling back to regular messages."
+            )
+            self._unavailable[channel.id] = time.monotonic() + WEBHOOK_RETRY_SECONDS
+            return None
+        except discord.HTTPException as e:
+            logger.warning(
+                f"Could not create a webhook in channel {channel.id} of guild {channel.guild.id}: {e}. Falling back to regular messages."
+            )
+            self._unavailable[channel.id] = time.monotonic() + WEBHOOK_RETRY_SECONDS
+            return None
+
+        credentials = WebhookCredentials(webhook.id, webhook.token)
+        await run_db(self._save, channel.guild.id, channel.id, credentials)
+        self._credentials[channel.id] = credentials
+        self._unavailable.pop(channel.id, None)
+        logger.info(
+            f"Created webhook {webhook.id} in channel {channel.id} of guild {channel.guild.id}."
+        )
+        return credentials
+
+    def _save(
+        self, guild_id: int, channel_id: int, credentials: WebhookCredentials
+    ) -> None:
+        """Stores a channel's webhook, run on the database thread pool."""
+        stmt = mysql_insert(ChannelWebhook.__table__).values(
+            channel_id=channel_id,
+            server_id=guild_id,
+            webhook_id=credentials.webhook_id,
+            webhook_token=credentials.token,
+        )
+        stmt = stmt.on_duplicate_key_update(
+            server_id=stmt.inserted.server_id,
+            webhook_id=stmt.inserted.webhook_id,
+            webhook_token=stmt.inserted.webhook_token,
+        )
+        with get_db_session() as session:
+            try:
+                session.execute(stmt)
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                logger.error(
+                    f"Failed to store webhook for channel {channel_id}: {e}",
+                    exc_info=True,
+                )
+
+    async def _forget(self, channel_id: int) -> None:
+        """Drops a channel's webhook from the cache and the database."""
+        self._credentials.pop(channel_id, None)
+        await run_db(self._delete, channel_id)
+
+    def _delete(self, channel_id: int) -> None:
+        """Blocking implementation of `_forget`, run on the database thread pool."""
+        with get_db_session() as session:
+            try:
+                session.execute(
+                    delete(ChannelWebhook).where(
+                        ChannelWebhook.channel_id == channel_id
+                    )
+                )
+                session.commit()
+            except Exception as e:
+                session.rollback()
+                logger.error(
+                    f"Failed to delete webhook for channel {channel_id}: {e}",
+                    exc_info=True,
+                )
+
+    async def close(self) -> None:
+        """Closes the shared HTTP session and its connection pool."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None